@@ -10,23 +10,47 @@ class CustomUserAdmin(UserAdmin):
         ("Profile", {"fields": ("display_name", "phone", "telegram_id", "telegram_username")}),
     )
     list_display = ("id", "username", "email", "phone", "display_name", "telegram_id", "is_staff", "is_active")
-    search_fields = ("username", "email", "phone", "telegram_id", "telegram_username")
+    search_fields = ("=email", "^username", "=telegram_id", "^telegram_username", "^phone")
     list_filter = ("is_staff", "is_active", "is_superuser")
 
 
+class UserTokenChangelistMixin:
+    # Columns the changelist actually renders/filters on; the change form still loads full rows.
+    changelist_only_fields: tuple[str, ...] = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related("user")
+        match = request.resolver_match
+        if self.changelist_only_fields and match and match.url_name.endswith("_changelist"):
+            queryset = queryset.only(*self.changelist_only_fields)
+        return queryset
+
+
 @admin.register(RefreshToken)
-class RefreshTokenAdmin(admin.ModelAdmin):
+class RefreshTokenAdmin(UserTokenChangelistMixin, admin.ModelAdmin):
     list_display = ("id", "user", "jti", "expires_at", "revoked_at", "created_at")
     list_filter = ("revoked_at",)
-    search_fields = ("user__username", "user__email", "jti", "token_hash")
+    list_select_related = ("user",)
+    search_fields = ("^user__username", "=user__email", "=jti")
     readonly_fields = ("jti", "token_hash", "expires_at", "revoked_at", "created_at", "user_agent", "ip_address")
+    changelist_only_fields = (
+        "id",
+        "jti",
+        "expires_at",
+        "revoked_at",
+        "created_at",
+        "user__id",
+        "user__username",
+        "user__email",
+    )
 
 
 @admin.register(TelegramMagicLink)
-class TelegramMagicLinkAdmin(admin.ModelAdmin):
+class TelegramMagicLinkAdmin(UserTokenChangelistMixin, admin.ModelAdmin):
     list_display = ("id", "user", "telegram_id", "telegram_username", "phone", "expires_at", "used_at", "created_at")
     list_filter = ("used_at", "expires_at", "created_at")
-    search_fields = ("user__username", "user__email", "phone", "telegram_id", "telegram_username", "token_hash")
+    list_select_related = ("user",)
+    search_fields = ("^user__username", "=user__email", "^phone", "=telegram_id", "^telegram_username")
     readonly_fields = (
         "token_hash",
         "expires_at",
@@ -37,11 +61,34 @@ class TelegramMagicLinkAdmin(admin.ModelAdmin):
         "phone",
         "created_at",
     )
+    changelist_only_fields = (
+        "id",
+        "telegram_id",
+        "telegram_username",
+        "phone",
+        "expires_at",
+        "used_at",
+        "created_at",
+        "user__id",
+        "user__username",
+        "user__email",
+    )
 
 
 @admin.register(PasswordResetToken)
-class PasswordResetTokenAdmin(admin.ModelAdmin):
+class PasswordResetTokenAdmin(UserTokenChangelistMixin, admin.ModelAdmin):
     list_display = ("user", "expires_at", "used_at", "created_at", "requested_ip")
-    search_fields = ("user__email", "user__username", "token_hash")
+    search_fields = ("=user__email", "^user__username")
     list_filter = ("used_at", "expires_at", "created_at")
+    list_select_related = ("user",)
     readonly_fields = ("user", "token_hash", "created_at", "expires_at", "used_at", "requested_ip")
+    changelist_only_fields = (
+        "id",
+        "expires_at",
+        "used_at",
+        "created_at",
+        "requested_ip",
+        "user__id",
+        "user__username",
+        "user__email",
+    )
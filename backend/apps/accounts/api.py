@@ -2,16 +2,18 @@ import hashlib
 import hmac
 import json
 import time
-from datetime import UTC, datetime, timedelta
-from uuid import UUID
-from urllib.parse import parse_qsl
+from datetime import timedelta
+from functools import lru_cache, partial
+from urllib.parse import unquote_plus
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import transaction
+from django.core.signals import setting_changed
+from django.db import IntegrityError, transaction
+from django.dispatch import receiver
 from django.http import JsonResponse
 from django.utils import timezone
 from django_redis import get_redis_connection
@@ -33,9 +35,10 @@ from apps.accounts.schemas import (
     TelegramAuthIn,
     TelegramMagicIn,
 )
-from apps.accounts.telegram_magic import consume_magic_token, get_magic_link_limit_metadata
+from apps.accounts.telegram_magic import consume_magic_token, get_magic_link_limit_metadata, safe_username
 from apps.accounts.telegram_notify import send_login_success_message
 from apps.common.auth import JWTAuth
+from apps.common.background import run_in_background
 from apps.common.exceptions import APIError
 from apps.common.ip import request_ip
 from apps.common.jwt import JWTDecodeError, create_access_token, create_refresh_token, decode_token
@@ -52,11 +55,32 @@ def _cookie_samesite(value: str) -> str:
     return "Lax"
 
 
-def _set_refresh_cookies(response, *, refresh_token: str, refresh_jti: str) -> None:
-    # Refresh token cookie: HttpOnly, narrow path, used only for /api/auth/refresh rotation.
+@lru_cache(maxsize=1)
+def _refresh_cookie_params() -> tuple[int, bool, str]:
     max_age = max(1, int(settings.JWT_REFRESH_TTL_DAYS)) * 86400
     secure = bool(getattr(settings, "AUTH_COOKIE_SECURE", not settings.DEBUG))
     samesite = _cookie_samesite(getattr(settings, "AUTH_COOKIE_SAMESITE", "Lax"))
+    return max_age, secure, samesite
+
+
+@lru_cache(maxsize=1)
+def _redis():
+    # redis-py clients are thread-safe and pooled; skip django_redis' alias lookup on every request.
+    return get_redis_connection("default")
+
+
+@receiver(setting_changed)
+def _reset_settings_caches(*, setting: str, **kwargs) -> None:
+    # Settings are fixed in production; override_settings in tests must still take effect.
+    if setting in {"JWT_REFRESH_TTL_DAYS", "AUTH_COOKIE_SECURE", "AUTH_COOKIE_SAMESITE", "DEBUG"}:
+        _refresh_cookie_params.cache_clear()
+    elif setting == "CACHES":
+        _redis.cache_clear()
+
+
+def _set_refresh_cookies(response, *, refresh_token: str, refresh_jti: str) -> None:
+    # Refresh token cookie: HttpOnly, narrow path, used only for /api/auth/refresh rotation.
+    max_age, secure, samesite = _refresh_cookie_params()
 
     response.set_cookie(
         settings.AUTH_REFRESH_COOKIE_NAME,
@@ -86,33 +110,23 @@ def _clear_refresh_cookies(response) -> None:
 
 
 def _normalize_identifier(email: str | None, username: str | None) -> tuple[str | None, str | None]:
-    normalized_email = (email or "").strip().lower() or None
-    normalized_username = (username or "").strip() or None
-    if not normalized_email and normalized_username and "@" in normalized_username:
+    normalized_email = (email.strip().lower() or None) if email else None
+    normalized_username = (username.strip() or None) if username else None
+    if normalized_email is None and normalized_username and "@" in normalized_username:
         normalized_email = normalized_username.lower()
         normalized_username = None
     return normalized_email, normalized_username
 
 
-def _safe_username(base: str) -> str:
-    candidate = "".join(ch for ch in base if ch.isalnum() or ch in {"_", "-", "."}).strip("_-.")[:150] or "user"
-    current = candidate
-    index = 1
-    while User.objects.filter(username__iexact=current).exists():
-        suffix = str(index)
-        current = f"{candidate[: max(1, 150 - len(suffix))]}{suffix}"
-        index += 1
-    return current
-
-
 def _safe_username_from_email(email: str) -> str:
     local = email.split("@", 1)[0] if "@" in email else email
-    return _safe_username(local)
+    return safe_username(local)
 
 
 def _serialize_user(user) -> AuthUserOut:
     display_name = user.display_name or user.username or user.email or None
-    return AuthUserOut(
+    # Values come straight from the ORM row; skip pydantic validation (Ninja still validates /me output).
+    return AuthUserOut.model_construct(
         id=str(user.id),
         email=user.email or None,
         username=user.username or None,
@@ -135,41 +149,29 @@ def _serialize_user_json(user) -> dict:
     return {"id": str(getattr(user, "id", ""))}
 
 
-def _stable_password_error_code(django_code: str) -> str:
-    mapping = {
-        "password_too_short": "min_length",
-        "password_too_common": "common_password",
-        "password_entirely_numeric": "numeric_only",
-        "password_too_similar": "too_similar",
-    }
-    return mapping.get(django_code, "invalid")
-
-
-def _stable_password_error_message(django_code: str, params: dict, fallback: str) -> str:
-    if django_code == "password_too_short":
-        min_length = int(params.get("min_length", 8) or 8)
-        return f"Password must be at least {min_length} characters."
-    if django_code == "password_too_common":
-        return "Password is too common."
-    if django_code == "password_entirely_numeric":
-        return "Password cannot be entirely numeric."
-    if django_code == "password_too_similar":
-        return "Password is too similar to your account information."
-    return fallback or "Password is invalid."
+# Django validator code -> (stable API code, message); password_too_short is parametric and handled inline.
+_PASSWORD_ERRORS = {
+    "password_too_common": ("common_password", "Password is too common."),
+    "password_entirely_numeric": ("numeric_only", "Password cannot be entirely numeric."),
+    "password_too_similar": ("too_similar", "Password is too similar to your account information."),
+}
 
 
 def _serialize_password_validation_errors(exc: DjangoValidationError) -> list[dict[str, str]]:
     items: list[dict[str, str]] = []
     for err in getattr(exc, "error_list", []) or []:
         django_code = str(getattr(err, "code", "") or "")
-        params = getattr(err, "params", {}) or {}
-        fallback = err.messages[0] if getattr(err, "messages", None) else "Password is invalid."
-        items.append(
-            {
-                "code": _stable_password_error_code(django_code),
-                "message": _stable_password_error_message(django_code, params, fallback),
-            }
-        )
+        known = _PASSWORD_ERRORS.get(django_code)
+        if known is not None:
+            code, message = known
+        elif django_code == "password_too_short":
+            params = getattr(err, "params", {}) or {}
+            min_length = int(params.get("min_length", 8) or 8)
+            code, message = "min_length", f"Password must be at least {min_length} characters."
+        else:
+            code = "invalid"
+            message = (err.messages[0] if getattr(err, "messages", None) else "") or "Password is invalid."
+        items.append({"code": code, "message": message})
 
     if not items:
         for message in getattr(exc, "messages", []) or []:
@@ -189,38 +191,57 @@ def _resolve_display_name(first_name: str | None, username: str | None, telegram
     return f"tg_{telegram_id}"
 
 
-def _get_or_create_user_from_magic_link(link) -> User:
-    if link.user_id:
-        return link.user
+def _integrity_error_target(exc: IntegrityError) -> str:
+    # psycopg exposes the violated constraint name; other backends only have the message.
+    diag = getattr(exc.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) or str(exc)
 
-    telegram_id = link.telegram_id
-    if not telegram_id:
-        raise APIError("Login link is invalid.", code="invalid_magic_link", status=401)
 
-    telegram_username = (link.telegram_username or "").strip() or None
-    display_name = _resolve_display_name(link.telegram_first_name, telegram_username, int(telegram_id))
+def _get_or_create_telegram_user(telegram_id: int, telegram_username: str | None, display_name: str) -> User:
     user = User.objects.filter(telegram_id=telegram_id).first()
     if not user:
         base_username = telegram_username or f"tg_{telegram_id}"
         user = User(
-            username=_safe_username(base_username),
+            username=safe_username(base_username),
             telegram_id=telegram_id,
             telegram_username=telegram_username or "",
             display_name=display_name,
             is_active=True,
         )
         user.set_unusable_password()
-        user.save()
-    else:
-        update_fields = []
-        if telegram_username and user.telegram_username != telegram_username:
-            user.telegram_username = telegram_username
-            update_fields.append("telegram_username")
-        if display_name and user.display_name != display_name:
-            user.display_name = display_name
-            update_fields.append("display_name")
-        if update_fields:
-            user.save(update_fields=update_fields)
+        try:
+            with transaction.atomic():
+                user.save()
+            return user
+        except IntegrityError as exc:
+            # A concurrent login for the same Telegram account won the INSERT; use its row.
+            user = User.objects.filter(telegram_id=telegram_id).first()
+            if not user:
+                raise APIError("Telegram login failed, please retry.", code="telegram_conflict", status=409) from exc
+
+    update_fields = []
+    if telegram_username and user.telegram_username != telegram_username:
+        user.telegram_username = telegram_username
+        update_fields.append("telegram_username")
+    if display_name and user.display_name != display_name:
+        user.display_name = display_name
+        update_fields.append("display_name")
+    if update_fields:
+        user.save(update_fields=update_fields)
+    return user
+
+
+def _get_or_create_user_from_magic_link(link) -> User:
+    if link.user_id:
+        return link.user
+
+    telegram_id = link.telegram_id
+    if not telegram_id:
+        raise APIError("Login link is invalid.", code="invalid_magic_link", status=401)
+
+    telegram_username = (link.telegram_username or "").strip() or None
+    display_name = _resolve_display_name(link.telegram_first_name, telegram_username, int(telegram_id))
+    user = _get_or_create_telegram_user(int(telegram_id), telegram_username, display_name)
 
     link.user = user
     link.save(update_fields=["user"])
@@ -228,12 +249,32 @@ def _get_or_create_user_from_magic_link(link) -> User:
 
 
 def _request_meta(request) -> tuple[str, str]:
-    user_agent = request.headers.get("user-agent", "")[:255]
+    # Read the WSGI environ directly; request.headers copies every header on first access.
+    user_agent = request.META.get("HTTP_USER_AGENT", "")[:255]
     return user_agent, request_ip(request)
 
 
-def _hash_refresh_token(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+# BLAKE2b keys are capped at 64 bytes; condense whatever was configured to 32, once per process.
+_REFRESH_HASH_KEY = hashlib.sha256(settings.REFRESH_TOKEN_HASH_KEY.encode("utf-8")).digest()
+
+
+def _hash_refresh_token(token: str) -> bytes:
+    # Only called with tokens we minted or that passed decode_token, i.e. base64url JWTs: always ASCII.
+    return hashlib.blake2b(token.encode("ascii"), digest_size=16, key=_REFRESH_HASH_KEY).digest()
+
+
+def _legacy_refresh_token_hash(token: str) -> bytes:
+    # Rows written before keyed digests hold SHA-256; they age out after JWT_REFRESH_TTL_DAYS.
+    return hashlib.sha256(token.encode("ascii")).digest()
+
+
+def _refresh_token_hash_matches(stored_hash, token: str) -> bool:
+    if stored_hash is None:
+        return False
+    if hmac.compare_digest(stored_hash, _hash_refresh_token(token)):
+        return True
+    # Only a 32-byte digest can be a legacy SHA-256 one; skip hashing again otherwise.
+    return len(stored_hash) == 32 and hmac.compare_digest(stored_hash, _legacy_refresh_token_hash(token))
 
 
 def _payload_from_args(args: tuple[object, ...], kwargs: dict[str, object], key: str):
@@ -272,13 +313,27 @@ def _rate_key_forgot_identifier(request, args: tuple[object, ...], kwargs: dict[
     return f"username:{raw.lower()}"
 
 
+def _decode_refresh_cached(request, refresh_value: str) -> dict:
+    # The refresh rate-limit key and the view both need the decoded token; verify it once per request.
+    try:
+        cached_value, cached_payload = request._refresh_decoded
+    except AttributeError:
+        pass
+    else:
+        if cached_value == refresh_value:
+            return cached_payload
+    decoded = decode_token(refresh_value, expected_type="refresh")
+    request._refresh_decoded = (refresh_value, decoded)
+    return decoded
+
+
 def _rate_key_refresh_user_or_ip(request, args: tuple[object, ...], kwargs: dict[str, object]) -> str:
     payload = _payload_from_args(args, kwargs, "payload")
     refresh_value = getattr(payload, "refresh", None) if payload else None
     if not refresh_value:
         return request_ip(request)
     try:
-        decoded = decode_token(refresh_value, expected_type="refresh")
+        decoded = _decode_refresh_cached(request, refresh_value)
     except JWTDecodeError:
         return request_ip(request)
     user_id = decoded.get("sub")
@@ -288,16 +343,18 @@ def _rate_key_refresh_user_or_ip(request, args: tuple[object, ...], kwargs: dict
 
 
 def _get_magic_limit_metadata_cached(request, args: tuple[object, ...], kwargs: dict[str, object]):
-    cached = getattr(request, "_magic_limit_metadata", None)
-    if cached is not None:
-        return cached
+    try:
+        # Set by the first rule; the other magic-link rules on the same request reuse it.
+        return request._magic_limit_metadata
+    except AttributeError:
+        pass
     payload = _payload_from_args(args, kwargs, "payload")
     token = getattr(payload, "token", None) if payload else None
     if not token:
         metadata = get_magic_link_limit_metadata("")
     else:
         metadata = get_magic_link_limit_metadata(token)
-    setattr(request, "_magic_limit_metadata", metadata)
+    request._magic_limit_metadata = metadata
     return metadata
 
 
@@ -318,8 +375,8 @@ def _find_user_by_identifier(identifier: str):
     if not candidate:
         return None
     if "@" in candidate:
-        return User.objects.filter(email__iexact=candidate.lower()).first()
-    return User.objects.filter(username__iexact=candidate).first()
+        return User.objects.filter(email__lower=candidate.lower()).first()
+    return User.objects.filter(username__lower=candidate.lower()).first()
 
 
 def _issue_tokens(user, request) -> tuple[dict, RefreshToken]:
@@ -328,9 +385,9 @@ def _issue_tokens(user, request) -> tuple[dict, RefreshToken]:
     user_agent, ip_address = _request_meta(request)
     token_record = RefreshToken.objects.create(
         user=user,
-        jti=UUID(str(refresh_payload["jti"])),
+        jti=refresh_payload["jti"],
         token_hash=_hash_refresh_token(refresh),
-        expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=UTC),
+        expires_at=refresh_payload["exp"],
         user_agent=user_agent,
         ip_address=ip_address or None,
     )
@@ -340,25 +397,70 @@ def _issue_tokens(user, request) -> tuple[dict, RefreshToken]:
 def _revoke_token(token_record: RefreshToken, replaced_by: RefreshToken | None = None) -> None:
     token_record.revoked_at = timezone.now()
     token_record.replaced_by = replaced_by
-    token_record.save(update_fields=["revoked_at", "replaced_by"])
+    # One UPDATE keyed by pk; the revoked_at guard keeps an already-revoked row's timestamp intact.
+    RefreshToken.objects.filter(pk=token_record.pk, revoked_at__isnull=True).update(
+        revoked_at=token_record.revoked_at,
+        replaced_by_id=replaced_by.pk if replaced_by else None,
+    )
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    # Built lazily: hashing at import time would slow every process start by a full hash.
+    return make_password("dummy-password-for-timing")
 
 
 def _authenticate(email: str | None, username: str | None, password: str):
     user = None
     if email:
-        user = User.objects.filter(email__iexact=email).first()
+        user = User.objects.filter(email__lower=email).first()
     elif username:
-        user = User.objects.filter(username__iexact=username).first()
+        user = User.objects.filter(username__lower=username.lower()).first()
 
-    if not user or not check_password(password, user.password):
+    if not user or not user.has_usable_password():
+        # Spend the same hashing time as a real account so unknown identifiers (and Telegram-only
+        # accounts, whose unusable password would otherwise fail instantly) are not revealed by latency.
+        check_password(password, _dummy_password_hash())
+        raise APIError("Invalid credentials.", code="invalid_credentials", status=401)
+    # Model check_password re-hashes legacy PBKDF2 hashes with the preferred hasher on success.
+    if not user.check_password(password):
         raise APIError("Invalid credentials.", code="invalid_credentials", status=401)
     if not user.is_active:
         raise APIError("Account is disabled.", code="inactive_user", status=403)
     return user
 
 
-def _parse_telegram_init_data(init_data: str) -> dict[str, str]:
-    return dict(parse_qsl(init_data, keep_blank_values=True))
+def _unquote_init_data_part(part: str) -> str:
+    # Most Telegram fields are plain ASCII; only pay for percent-decoding when it is needed.
+    if "%" in part or "+" in part:
+        return unquote_plus(part)
+    return part
+
+
+def _parse_telegram_init_data(init_data: str) -> tuple[dict[str, str], str | None]:
+    # Single pass: split out the signature while collecting the signed fields. Mirrors
+    # parse_qsl(keep_blank_values=True): "&"-separated, empty segments skipped, last value wins.
+    fields: dict[str, str] = {}
+    incoming_hash = None
+    for segment in init_data.split("&"):
+        if not segment:
+            continue
+        raw_key, _, raw_value = segment.partition("=")
+        key = _unquote_init_data_part(raw_key)
+        value = _unquote_init_data_part(raw_value)
+        if key == "hash":
+            incoming_hash = value
+        else:
+            fields[key] = value
+    return fields, incoming_hash
+
+
+@lru_cache(maxsize=1)
+def _telegram_hmac_template(bot_token: str):
+    # Keyed by the token itself so a rotated TELEGRAM_BOT_TOKEN never reuses a stale key.
+    # Callers must .copy() it: the keyed ipad/opad state is reused, the template is never updated.
+    secret = hashlib.sha256(bot_token.encode("utf-8")).digest()
+    return hmac.new(secret, digestmod="sha256")
 
 
 def _verify_telegram_hash(init_data: str) -> dict[str, str]:
@@ -366,17 +468,27 @@ def _verify_telegram_hash(init_data: str) -> dict[str, str]:
     if not bot_token:
         raise APIError("Telegram login is not configured.", code="telegram_not_configured", status=500)
 
-    parsed = _parse_telegram_init_data(init_data)
-    incoming_hash = parsed.pop("hash", None)
+    parsed, incoming_hash = _parse_telegram_init_data(init_data)
     if not incoming_hash:
         raise APIError("Telegram auth hash is missing.", code="invalid_telegram_data", status=401)
 
-    data_check_string = "\n".join(f"{key}={parsed[key]}" for key in sorted(parsed.keys()))
-    secret = hashlib.sha256(bot_token.encode("utf-8")).digest()
-    expected_hash = hmac.new(secret, data_check_string.encode("utf-8"), hashlib.sha256).hexdigest()
-    if not hmac.compare_digest(expected_hash, incoming_hash):
+    # data_check_string assembled straight into one UTF-8 buffer: "key=value" lines sorted by key.
+    data_check = bytearray()
+    for key, value in sorted(parsed.items()):
+        if data_check:
+            data_check += b"\n"
+        data_check += f"{key}={value}".encode("utf-8")
+    try:
+        incoming_digest = bytes.fromhex(incoming_hash)
+    except ValueError as exc:
+        raise APIError("Telegram auth hash is invalid.", code="invalid_telegram_hash", status=401) from exc
+    mac = _telegram_hmac_template(bot_token).copy()
+    mac.update(data_check)
+    expected_digest = mac.digest()
+    if not hmac.compare_digest(expected_digest, incoming_digest):
         raise APIError("Telegram auth hash is invalid.", code="invalid_telegram_hash", status=401)
-    parsed["_hash"] = incoming_hash
+    # Canonical lowercase hex: fromhex() accepts either case, and the replay key must not.
+    parsed["_hash"] = expected_digest.hex()
     return parsed
 
 
@@ -403,8 +515,7 @@ def _enforce_telegram_widget_freshness_and_replay(verified_data: dict[str, str])
     # Replay protection: the Telegram signature is stable per payload; mark as seen for max_age seconds.
     key = f"tg_auth_seen:{incoming_hash}"
     try:
-        redis = get_redis_connection("default")
-        created = redis.set(key, "1", nx=True, ex=max_age)
+        created = _redis().set(key, "1", nx=True, ex=max_age)
     except Exception as exc:
         raise APIError("telegram_auth_unavailable", code="telegram_auth_unavailable", status=503) from exc
     if not created:
@@ -468,13 +579,6 @@ def register(request, payload: RegisterIn):
             fields={"password": _serialize_password_validation_errors(exc)},
         ) from exc
 
-    if email and User.objects.filter(email__iexact=email).exists():
-        fields["email"] = "Email already exists."
-    if username and User.objects.filter(username__iexact=username).exists():
-        fields["username"] = "Username already exists."
-    if fields:
-        raise APIError("Validation failed.", code="validation_error", fields=fields, status=422)
-
     resolved_username = username or _safe_username_from_email(email or "user")
     user = User(
         username=resolved_username,
@@ -482,7 +586,23 @@ def register(request, payload: RegisterIn):
         display_name=resolved_username,
     )
     user.set_password(payload.password)
-    user.save()
+    try:
+        # Let the case-insensitive unique constraints reject duplicates; savepoint keeps the outer transaction usable.
+        with transaction.atomic():
+            user.save()
+    except IntegrityError as exc:
+        # The violated constraint names only one field; report every taken one, as clients expect.
+        if email and User.objects.filter(email__iexact=email).exists():
+            fields["email"] = "Email already exists."
+        if User.objects.filter(username__iexact=resolved_username).exists():
+            fields["username"] = "Username already exists."
+        if not fields:
+            # The conflicting row was deleted in the meantime; fall back to the constraint name.
+            if email and "email" in _integrity_error_target(exc):
+                fields["email"] = "Email already exists."
+            else:
+                fields["username"] = "Username already exists."
+        raise APIError("Validation failed.", code="validation_error", fields=fields, status=422) from exc
 
     tokens, _token_record = _issue_tokens(user, request)
     response_payload: dict = {"access": tokens["access"], "user": _serialize_user_json(user)}
@@ -502,8 +622,8 @@ def register(request, payload: RegisterIn):
     ],
     methods=("POST",),
 )
-@transaction.atomic
 def login(request, payload: LoginIn):
+    # No surrounding transaction: password hashing is slow and must not hold one open.
     email, username = _normalize_identifier(payload.email, payload.username)
     user = _authenticate(email, username, payload.password)
     tokens, _token_record = _issue_tokens(user, request)
@@ -515,13 +635,33 @@ def login(request, payload: LoginIn):
     return response
 
 
+def _reject_refresh(token_jti, user_id, refresh_value: str) -> JsonResponse:
+    # Slow path, only for tokens the live-row lookup rejected: work out which error applies.
+    token_record = (
+        RefreshToken.objects.filter(jti=token_jti, user_id=user_id)
+        .only("token_hash", "revoked_at", "replaced_by_id", "expires_at")
+        .first()
+    )
+    if not token_record or not _refresh_token_hash_matches(token_record.token_hash, refresh_value):
+        return JsonResponse({"detail": "invalid_refresh", "code": "invalid_refresh", "fields": {}}, status=401)
+    if token_record.is_revoked or token_record.replaced_by_id is not None:
+        # Treat reuse of rotated/revoked refresh tokens as a compromise indicator.
+        RefreshToken.objects.filter(user_id=user_id, revoked_at__isnull=True).update(revoked_at=timezone.now())
+        return JsonResponse({"detail": "refresh_reuse", "code": "refresh_reuse", "fields": {}}, status=401)
+    if token_record.is_expired:
+        # No revoke write: an expired row can never rotate, and cleanup_tokens purges it.
+        return JsonResponse({"detail": "expired_refresh", "code": "expired_refresh", "fields": {}}, status=401)
+    # Live row that a concurrent refresh holds locked (e.g. two tabs refreshing at once). The
+    # client should retry; its cookies are still valid and must not be cleared.
+    return JsonResponse({"detail": "refresh_in_progress", "code": "refresh_in_progress", "fields": {}}, status=409)
+
+
 @router.post("/refresh", response=RefreshResponse)
 @rate_limit_rules(
     "auth_refresh",
     [RateLimitRule(name="user_or_ip", rate=settings.AUTH_REFRESH_RATE, key_func=_rate_key_refresh_user_or_ip)],
     methods=("POST",),
 )
-@transaction.atomic
 def refresh_tokens(request, payload: RefreshIn | None = None):
     refresh_value = payload.refresh if payload and payload.refresh else None
     if not refresh_value:
@@ -532,7 +672,7 @@ def refresh_tokens(request, payload: RefreshIn | None = None):
         return response
 
     try:
-        decoded = decode_token(refresh_value, expected_type="refresh")
+        decoded = _decode_refresh_cached(request, refresh_value)
     except JWTDecodeError:
         response = JsonResponse({"detail": "invalid_refresh", "code": "invalid_refresh", "fields": {}}, status=401)
         _clear_refresh_cookies(response)
@@ -545,36 +685,37 @@ def refresh_tokens(request, payload: RefreshIn | None = None):
         _clear_refresh_cookies(response)
         return response
 
-    token_record = RefreshToken.objects.select_related("user").filter(jti=token_jti, user_id=user_id).first()
-    if not token_record:
-        response = JsonResponse({"detail": "invalid_refresh", "code": "invalid_refresh", "fields": {}}, status=401)
-        _clear_refresh_cookies(response)
-        return response
-    if token_record.token_hash != _hash_refresh_token(refresh_value):
-        response = JsonResponse({"detail": "invalid_refresh", "code": "invalid_refresh", "fields": {}}, status=401)
-        _clear_refresh_cookies(response)
-        return response
-    if token_record.is_revoked or token_record.replaced_by_id is not None:
-        # Treat reuse of rotated/revoked refresh tokens as a compromise indicator.
-        RefreshToken.objects.filter(user_id=user_id, revoked_at__isnull=True).update(revoked_at=timezone.now())
-        response = JsonResponse({"detail": "refresh_reuse", "code": "refresh_reuse", "fields": {}}, status=401)
-        _clear_refresh_cookies(response)
-        return response
-    if token_record.is_expired:
-        _revoke_token(token_record)
-        response = JsonResponse({"detail": "expired_refresh", "code": "expired_refresh", "fields": {}}, status=401)
-        _clear_refresh_cookies(response)
-        return response
-
-    user = token_record.user
-    if not user.is_active:
-        _revoke_token(token_record)
-        response = JsonResponse({"detail": "inactive_user", "code": "inactive_user", "fields": {}}, status=403)
-        _clear_refresh_cookies(response)
-        return response
-
-    new_tokens, new_record = _issue_tokens(user, request)
-    _revoke_token(token_record, replaced_by=new_record)
+    with transaction.atomic():
+        # Fast path: only a live (unrevoked, unrotated, unexpired) row matches. Lock it so two
+        # concurrent refreshes of the same token cannot both rotate it; the loser skips the
+        # locked row. of=("self",) keeps the joined user row unlocked.
+        token_record = (
+            RefreshToken.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("user")
+            .filter(
+                jti=token_jti,
+                user_id=user_id,
+                revoked_at__isnull=True,
+                replaced_by__isnull=True,
+                expires_at__gt=timezone.now(),
+            )
+            .first()
+        )
+        if not token_record or not _refresh_token_hash_matches(token_record.token_hash, refresh_value):
+            response = _reject_refresh(token_jti, user_id, refresh_value)
+            if response.status_code != 409:
+                _clear_refresh_cookies(response)
+            return response
+
+        user = token_record.user
+        if not user.is_active:
+            _revoke_token(token_record)
+            response = JsonResponse({"detail": "inactive_user", "code": "inactive_user", "fields": {}}, status=403)
+            _clear_refresh_cookies(response)
+            return response
+
+        new_tokens, new_record = _issue_tokens(user, request)
+        _revoke_token(token_record, replaced_by=new_record)
 
     response_payload: dict = {"access": new_tokens["access"]}
     if getattr(settings, "AUTH_RETURN_REFRESH_IN_BODY", False):
@@ -585,7 +726,6 @@ def refresh_tokens(request, payload: RefreshIn | None = None):
 
 
 @router.post("/logout", auth=JWTAuth(), response={204: None})
-@transaction.atomic
 def logout(request, payload: LogoutIn | None = None):
     rsid = (request.COOKIES.get(settings.AUTH_REFRESH_SESSION_COOKIE_NAME) or "").strip()
     if rsid:
@@ -595,11 +735,10 @@ def logout(request, payload: LogoutIn | None = None):
             decoded = decode_token(payload.refresh, expected_type="refresh")
         except JWTDecodeError as exc:
             raise APIError("Refresh token is invalid.", code="invalid_refresh", status=401) from exc
-        token_jti = decoded.get("jti")
-        token_hash = _hash_refresh_token(payload.refresh)
-        RefreshToken.objects.filter(user=request.auth, jti=token_jti, token_hash=token_hash, revoked_at__isnull=True).update(
-            revoked_at=timezone.now()
-        )
+        live = RefreshToken.objects.filter(user=request.auth, jti=decoded.get("jti"), revoked_at__isnull=True)
+        now = timezone.now()
+        if not live.filter(token_hash=_hash_refresh_token(payload.refresh)).update(revoked_at=now):
+            live.filter(token_hash=_legacy_refresh_token_hash(payload.refresh)).update(revoked_at=now)
 
     response = JsonResponse({}, status=204)
     _clear_refresh_cookies(response)
@@ -607,7 +746,6 @@ def logout(request, payload: LogoutIn | None = None):
 
 
 @router.post("/logout-all", auth=JWTAuth(), response={204: None})
-@transaction.atomic
 def logout_all(request):
     RefreshToken.objects.filter(user=request.auth, revoked_at__isnull=True).update(revoked_at=timezone.now())
     response = JsonResponse({}, status=204)
@@ -641,7 +779,7 @@ def telegram_magic_login(request, payload: TelegramMagicIn):
     tokens, _token_record = _issue_tokens(user, request)
     telegram_id = link.telegram_id or user.telegram_id
     if telegram_id:
-        send_login_success_message(int(telegram_id))
+        transaction.on_commit(partial(run_in_background, send_login_success_message, int(telegram_id)))
     response_payload: dict = {"access": tokens["access"], "user": _serialize_user_json(user)}
     if getattr(settings, "AUTH_RETURN_REFRESH_IN_BODY", False):
         response_payload["refresh"] = tokens["refresh"]
@@ -662,28 +800,7 @@ def telegram_login(request, payload: TelegramAuthIn):
     _enforce_telegram_widget_freshness_and_replay(verified_data)
     telegram_id, telegram_username, display_name = _extract_telegram_user(verified_data)
 
-    user = User.objects.filter(telegram_id=telegram_id).first()
-    if not user:
-        base_username = telegram_username or f"tg_{telegram_id}"
-        user = User(
-            username=_safe_username(base_username),
-            telegram_id=telegram_id,
-            telegram_username=telegram_username or "",
-            display_name=display_name,
-            is_active=True,
-        )
-        user.set_unusable_password()
-        user.save()
-    else:
-        update_fields = []
-        if telegram_username and user.telegram_username != telegram_username:
-            user.telegram_username = telegram_username
-            update_fields.append("telegram_username")
-        if display_name and user.display_name != display_name:
-            user.display_name = display_name
-            update_fields.append("display_name")
-        if update_fields:
-            user.save(update_fields=update_fields)
+    user = _get_or_create_telegram_user(telegram_id, telegram_username, display_name)
 
     tokens, _token_record = _issue_tokens(user, request)
     response_payload: dict = {"access": tokens["access"], "user": _serialize_user_json(user)}
@@ -694,6 +811,14 @@ def telegram_login(request, payload: TelegramAuthIn):
     return response
 
 
+def _send_reset_email_quietly(user, link: str) -> None:
+    try:
+        send_reset_email(user, link)
+    except Exception:
+        # Keep a generic response to avoid account enumeration or provider leakage.
+        pass
+
+
 @router.post("/forgot-password", response=DetailResponse)
 @rate_limit_rules(
     "auth_forgot_password",
@@ -715,11 +840,9 @@ def forgot_password(request, payload: ForgotPasswordIn):
             requested_ip=request_ip(request),
         )
         link = build_reset_link(raw_token)
-        try:
-            send_reset_email(user, link)
-        except Exception:
-            # Keep a generic response to avoid account enumeration or provider leakage.
-            pass
+        # Send off the request thread once the token row is committed, so SMTP latency
+        # neither holds the transaction open nor delays the response.
+        transaction.on_commit(partial(run_in_background, _send_reset_email_quietly, user, link))
     return {"detail": "if_account_exists_email_sent"}
 
 
@@ -729,7 +852,6 @@ def forgot_password(request, payload: ForgotPasswordIn):
     [RateLimitRule(name="ip", rate=settings.AUTH_RESET_RATE, key_func=_rate_key_ip)],
     methods=("POST",),
 )
-@transaction.atomic
 def reset_password(request, payload: ResetPasswordIn):
     token_hash = hash_reset_token(payload.token)
     reset_token = PasswordResetToken.objects.select_related("user").filter(token_hash=token_hash).first()
@@ -751,14 +873,19 @@ def reset_password(request, payload: ResetPasswordIn):
         ) from exc
 
     user = reset_token.user
+    # Hash before opening the transaction; only the writes below need to be atomic.
     user.set_password(payload.newPassword)
-    user.save(update_fields=["password"])
-    reset_token.used_at = timezone.now()
-    reset_token.save(update_fields=["used_at"])
-
-    # Security: password reset is an account recovery event; revoke sessions and invalidate other reset tokens.
-    RefreshToken.objects.filter(user=user, revoked_at__isnull=True).update(revoked_at=timezone.now())
-    PasswordResetToken.objects.filter(user=user, used_at__isnull=True).exclude(id=reset_token.id).update(used_at=timezone.now())
+    now = timezone.now()
+    with transaction.atomic():
+        # Claim the token with a conditional UPDATE so two concurrent resets cannot both use it.
+        claimed = PasswordResetToken.objects.filter(id=reset_token.id, used_at__isnull=True).update(used_at=now)
+        if not claimed:
+            raise APIError("token_used", code="token_used", status=401)
+        user.save(update_fields=["password"])
+
+        # Security: password reset is an account recovery event; revoke sessions and invalidate other reset tokens.
+        RefreshToken.objects.filter(user=user, revoked_at__isnull=True).update(revoked_at=now)
+        PasswordResetToken.objects.filter(user=user, used_at__isnull=True).update(used_at=now)
     response = JsonResponse({"detail": "password_reset_ok"}, status=200)
     _clear_refresh_cookies(response)
     return response
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
@@ -10,7 +11,7 @@ from apps.accounts.models import PasswordResetToken, RefreshToken, TelegramMagic
 
 
 class Command(BaseCommand):
-    help = "Delete old/expired auth artifacts (password reset tokens, telegram magic links, revoked refresh tokens)."
+    help = "Delete old/expired auth artifacts (password reset tokens, telegram magic links, revoked/expired refresh tokens)."
 
     def add_arguments(self, parser) -> None:
         parser.add_argument(
@@ -19,27 +20,64 @@ class Command(BaseCommand):
             default=30,
             help="Delete eligible records older than N days (default: 30).",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=4096,
+            help="Rows deleted per transaction (default: 4096).",
+        )
+
+    @staticmethod
+    def _delete_in_batches(queryset, batch_size: int, before_delete=None) -> int:
+        # Walk the eligible rows by primary key so each DELETE touches a bounded set of rows and
+        # holds its locks only for one short transaction.
+        # _raw_delete issues a bare DELETE ... WHERE, skipping the collector and delete signals.
+        # That is only correct while these models have no pre/post_delete receivers and no
+        # Python-side cascades; revisit this command if either is added.
+        deleted = 0
+        last_pk = None
+        while True:
+            window = queryset.order_by("pk")
+            if last_pk is not None:
+                window = window.filter(pk__gt=last_pk)
+            pks = list(window.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return deleted
+            last_pk = pks[-1]
+            batch = queryset.model._base_manager.filter(pk__in=pks)
+            with transaction.atomic(using=batch.db):
+                if before_delete is not None:
+                    before_delete(pks)
+                deleted += batch._raw_delete(batch.db)
 
     def handle(self, *args, **options) -> None:
         days = int(options.get("days") or 30)
         if days < 1:
             days = 1
 
+        batch_size = max(1, int(options.get("batch_size") or 4096))
+
         now = timezone.now()
         cutoff = now - timedelta(days=days)
 
         reset_qs = PasswordResetToken.objects.filter(created_at__lt=cutoff).filter(
             Q(used_at__isnull=False) | Q(expires_at__lt=now)
         )
-        reset_deleted, _ = reset_qs.delete()
+        reset_deleted = self._delete_in_batches(reset_qs, batch_size)
 
         magic_qs = TelegramMagicLink.objects.filter(created_at__lt=cutoff).filter(
             Q(used_at__isnull=False) | Q(expires_at__lt=now)
         )
-        magic_deleted, _ = magic_qs.delete()
+        magic_deleted = self._delete_in_batches(magic_qs, batch_size)
+
+        # Expired tokens are no longer revoked on use, so purge them by expiry as well.
+        refresh_qs = RefreshToken.objects.filter(Q(revoked_at__lt=cutoff) | Q(expires_at__lt=cutoff))
+
+        def detach_successors(pks: list) -> None:
+            # replaced_by is SET_NULL in Python only; detach rows pointing into this batch first.
+            RefreshToken.objects.filter(replaced_by__in=pks).exclude(pk__in=pks).update(replaced_by=None)
 
-        refresh_qs = RefreshToken.objects.filter(revoked_at__isnull=False, revoked_at__lt=cutoff)
-        refresh_deleted, _ = refresh_qs.delete()
+        refresh_deleted = self._delete_in_batches(refresh_qs, batch_size, before_delete=detach_successors)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Admin search on users uses UPPER(email)/UPPER(username) lookups; trigram GIST
+# indexes keep those (and substring searches) off a sequential scan on Postgres.
+TRIGRAM_INDEXES = (
+    ("accounts_user_email_gist_trgm_idx", "email"),
+    ("accounts_user_username_gist_trgm_idx", "username"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON accounts_user USING gist (upper({column}) gist_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_passwordresettoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
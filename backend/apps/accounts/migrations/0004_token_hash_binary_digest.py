@@ -0,0 +1,78 @@
+from django.db import migrations, models
+
+
+TOKEN_MODELS = ("RefreshToken", "TelegramMagicLink", "PasswordResetToken")
+
+
+def hex_to_digest(apps, schema_editor):
+    for model_name in TOKEN_MODELS:
+        model = apps.get_model("accounts", model_name)
+        rows = model.objects.exclude(token_hash__isnull=True).values_list("pk", "token_hash")
+        for pk, token_hash in rows.iterator():
+            model.objects.filter(pk=pk).update(token_digest=bytes.fromhex(token_hash))
+
+
+def digest_to_hex(apps, schema_editor):
+    for model_name in TOKEN_MODELS:
+        model = apps.get_model("accounts", model_name)
+        rows = model.objects.exclude(token_digest__isnull=True).values_list("pk", "token_digest")
+        for pk, token_digest in rows.iterator():
+            model.objects.filter(pk=pk).update(token_hash=bytes(token_digest).hex())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_trigram_search_indexes"),
+    ]
+
+    operations = [
+        # Nullable while the digest column is filled so the migration can also run backwards.
+        migrations.AlterField(
+            model_name="telegrammagiclink",
+            name="token_hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name="passwordresettoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="refreshtoken",
+            name="token_digest",
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name="telegrammagiclink",
+            name="token_digest",
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name="passwordresettoken",
+            name="token_digest",
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(hex_to_digest, digest_to_hex),
+        migrations.RemoveField(model_name="refreshtoken", name="token_hash"),
+        migrations.RemoveField(model_name="telegrammagiclink", name="token_hash"),
+        migrations.RemoveField(model_name="passwordresettoken", name="token_hash"),
+        migrations.RenameField(model_name="refreshtoken", old_name="token_digest", new_name="token_hash"),
+        migrations.RenameField(model_name="telegrammagiclink", old_name="token_digest", new_name="token_hash"),
+        migrations.RenameField(model_name="passwordresettoken", old_name="token_digest", new_name="token_hash"),
+        migrations.AlterField(
+            model_name="refreshtoken",
+            name="token_hash",
+            field=models.BinaryField(blank=True, max_length=32, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="telegrammagiclink",
+            name="token_hash",
+            field=models.BinaryField(db_index=True, max_length=32, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="passwordresettoken",
+            name="token_hash",
+            field=models.BinaryField(db_index=True, max_length=32, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-15 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_token_hash_binary_digest'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='refreshtoken',
+            index=models.Index(condition=models.Q(('revoked_at__isnull', True)), fields=['user'], name='refreshtoken_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-15 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('used_at__isnull', False)), fields=['created_at'], name='passwordresettoken_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refreshtoken',
+            index=models.Index(condition=models.Q(('revoked_at__isnull', False)), fields=['revoked_at'], name='refreshtoken_revoked_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegrammagiclink',
+            index=models.Index(condition=models.Q(('used_at__isnull', False)), fields=['created_at'], name='telegrammagiclink_used_idx'),
+        ),
+    ]
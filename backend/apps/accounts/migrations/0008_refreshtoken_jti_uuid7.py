@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-15 23:15
+
+import apps.common.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_token_cleanup_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='refreshtoken',
+            name='jti',
+            field=models.UUIDField(db_index=True, default=apps.common.utils.uuid7, editable=False, unique=True),
+        ),
+    ]
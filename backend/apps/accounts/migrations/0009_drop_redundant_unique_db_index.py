@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-15 23:15
+
+import apps.common.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_refreshtoken_jti_uuid7'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='token_hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='refreshtoken',
+            name='jti',
+            field=models.UUIDField(default=apps.common.utils.uuid7, editable=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='telegrammagiclink',
+            name='token_hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+    ]
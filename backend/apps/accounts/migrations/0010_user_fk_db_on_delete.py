@@ -0,0 +1,73 @@
+# Generated by Django 6.0.2 on 2026-10-15 23:16
+
+import apps.common.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# (model, on delete action) for the user foreign keys whose cascade moves into Postgres.
+USER_FK_ACTIONS = (
+    ("RefreshToken", "CASCADE"),
+    ("PasswordResetToken", "CASCADE"),
+    ("TelegramMagicLink", "SET NULL"),
+)
+
+
+def _rewrite_user_fks(apps, schema_editor, with_action: bool):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    for model_name, action in USER_FK_ACTIONS:
+        model = apps.get_model("accounts", model_name)
+        field = model._meta.get_field("user")
+        table = model._meta.db_table
+        target = field.related_model._meta.db_table
+        target_column = field.target_field.column
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        names = [
+            name
+            for name, info in constraints.items()
+            if info["foreign_key"] == (target, target_column) and info["columns"] == [field.column]
+        ]
+        on_delete = f" ON DELETE {action}" if with_action else ""
+        for name in names:
+            schema_editor.execute(
+                f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(name)}, "
+                f"ADD CONSTRAINT {quote(name)} FOREIGN KEY ({quote(field.column)}) "
+                f"REFERENCES {quote(target)} ({quote(target_column)}){on_delete} DEFERRABLE INITIALLY DEFERRED"
+            )
+
+
+def add_db_on_delete(apps, schema_editor):
+    _rewrite_user_fks(apps, schema_editor, with_action=True)
+
+
+def remove_db_on_delete(apps, schema_editor):
+    _rewrite_user_fks(apps, schema_editor, with_action=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_drop_redundant_unique_db_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='user',
+            field=models.ForeignKey(on_delete=apps.common.deletion.PG_CASCADE, related_name='password_reset_tokens', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='refreshtoken',
+            name='user',
+            field=models.ForeignKey(on_delete=apps.common.deletion.PG_CASCADE, related_name='refresh_tokens', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='telegrammagiclink',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=apps.common.deletion.PG_SET_NULL, related_name='telegram_magic_links', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(add_db_on_delete, remove_db_on_delete),
+    ]
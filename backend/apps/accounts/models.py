@@ -1,10 +1,13 @@
-import uuid
 from datetime import timedelta
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from apps.common.deletion import PG_CASCADE, PG_SET_NULL
+from apps.common.utils import uuid7
+
 
 class User(AbstractUser):
     email = models.EmailField(unique=True, null=True, blank=True)
@@ -13,14 +16,23 @@ class User(AbstractUser):
     telegram_id = models.BigIntegerField(unique=True, null=True, blank=True)
     telegram_username = models.CharField(max_length=150, blank=True)
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Case-insensitive uniqueness; register relies on these instead of pre-checking.
+            models.UniqueConstraint(Lower("email"), name="accounts_user_email_ci_uniq"),
+            models.UniqueConstraint(Lower("username"), name="accounts_user_username_ci_uniq"),
+        ]
+
     def __str__(self) -> str:
         return self.email or self.username
 
 
 class RefreshToken(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="refresh_tokens")
-    jti = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, db_index=True)
-    token_hash = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    # On Postgres the FK's ON DELETE CASCADE (added in migration 0010, not tracked in model state)
+    # deletes these rows; a migration altering this field must re-add it (system check common.W001).
+    user = models.ForeignKey(User, on_delete=PG_CASCADE, related_name="refresh_tokens")
+    jti = models.UUIDField(default=uuid7, unique=True, editable=False)
+    token_hash = models.BinaryField(max_length=32, unique=True, null=True, blank=True)
     user_agent = models.CharField(max_length=255, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     expires_at = models.DateTimeField()
@@ -38,6 +50,18 @@ class RefreshToken(models.Model):
         indexes = [
             models.Index(fields=["user", "revoked_at"]),
             models.Index(fields=["expires_at"]),
+            # Active (unrevoked) tokens only; keeps logout-all and reuse revocation on a tiny btree.
+            models.Index(
+                fields=["user"],
+                condition=models.Q(revoked_at__isnull=True),
+                name="refreshtoken_user_active_idx",
+            ),
+            # cleanup_tokens purges by revoked_at; the (user, revoked_at) index cannot serve that range.
+            models.Index(
+                fields=["revoked_at"],
+                condition=models.Q(revoked_at__isnull=False),
+                name="refreshtoken_revoked_idx",
+            ),
         ]
 
     @property
@@ -57,14 +81,16 @@ class RefreshToken(models.Model):
 
 
 class TelegramMagicLink(models.Model):
+    # On Postgres the FK's ON DELETE SET NULL from migration 0010 does the nulling; keep it when
+    # altering this field (system check common.W001).
     user = models.ForeignKey(
         User,
-        on_delete=models.SET_NULL,
+        on_delete=PG_SET_NULL,
         related_name="telegram_magic_links",
         null=True,
         blank=True,
     )
-    token_hash = models.CharField(max_length=64, unique=True, db_index=True)
+    token_hash = models.BinaryField(max_length=32, unique=True)
     expires_at = models.DateTimeField(db_index=True)
     used_at = models.DateTimeField(null=True, blank=True)
     telegram_id = models.BigIntegerField(null=True, blank=True, db_index=True)
@@ -77,6 +103,12 @@ class TelegramMagicLink(models.Model):
         indexes = [
             models.Index(fields=["user", "created_at"], name="accounts_te_user_id_4c9eb4_idx"),
             models.Index(fields=["created_at"], name="accounts_te_created_fa9a38_idx"),
+            # Used-link half of the cleanup_tokens predicate; the expired half rides on expires_at.
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(used_at__isnull=False),
+                name="telegrammagiclink_used_idx",
+            ),
         ]
 
     @property
@@ -96,8 +128,10 @@ def _default_password_reset_expiry():
 
 
 class PasswordResetToken(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="password_reset_tokens")
-    token_hash = models.CharField(max_length=64, unique=True, db_index=True)
+    # ON DELETE CASCADE lives on the Postgres constraint (migration 0010); keep it when altering
+    # this field (system check common.W001).
+    user = models.ForeignKey(User, on_delete=PG_CASCADE, related_name="password_reset_tokens")
+    token_hash = models.BinaryField(max_length=32, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(default=_default_password_reset_expiry, db_index=True)
     used_at = models.DateTimeField(null=True, blank=True)
@@ -107,6 +141,12 @@ class PasswordResetToken(models.Model):
         indexes = [
             models.Index(fields=["user", "created_at"]),
             models.Index(fields=["expires_at"]),
+            # Used-token half of the cleanup_tokens predicate; the expired half rides on expires_at.
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(used_at__isnull=False),
+                name="passwordresettoken_used_idx",
+            ),
         ]
 
     @property
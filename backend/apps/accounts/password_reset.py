@@ -4,19 +4,20 @@ import secrets
 from django.conf import settings
 from django.core.mail import send_mail
 
+from apps.common.utils import public_app_url
+
 
 def generate_reset_token() -> str:
     return secrets.token_urlsafe(48)
 
 
-def hash_reset_token(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def hash_reset_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def build_reset_link(raw_token: str) -> str:
-    base_url = settings.PUBLIC_APP_URL.rstrip("/")
     # Use URL fragment to avoid leaking one-time tokens via Referer/logs/proxies.
-    return f"{base_url}/reset-password#token={raw_token}"
+    return f"{public_app_url()}/reset-password#token={raw_token}"
 
 
 def send_reset_email(user, link: str) -> None:
@@ -37,6 +38,3 @@ def send_reset_email(user, link: str) -> None:
         recipient_list=[recipient],
         fail_silently=False,
     )
-
-    if settings.EMAIL_BACKEND == "django.core.mail.backends.console.EmailBackend":
-        print(f"[password-reset] {recipient}: {link}")
@@ -1,15 +1,22 @@
 import hashlib
 import os
+import re
 import secrets
 from dataclasses import dataclass
 from datetime import timedelta
 
 from django.conf import settings
+from django.db import connection
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 from apps.accounts.models import TelegramMagicLink, User
 from apps.common.exceptions import APIError
 from apps.common.rate_limit import enforce_rate_limit
+from apps.common.utils import public_app_url
+
+
+_PHONE_STRIP = re.compile(r"[^\d+]+")
 
 
 def normalize_phone(phone_raw: str) -> str:
@@ -17,8 +24,8 @@ def normalize_phone(phone_raw: str) -> str:
     if not raw:
         raise APIError("Phone number is required.", code="validation_error", status=422, fields={"phone": "required"})
 
-    cleaned = "".join(ch for ch in raw if ch.isdigit() or ch == "+")
-    digits = "".join(ch for ch in cleaned if ch.isdigit())
+    cleaned = _PHONE_STRIP.sub("", raw)
+    digits = cleaned.replace("+", "")
     if cleaned.startswith("00") and len(digits) > 2:
         digits = digits[2:]
 
@@ -39,19 +46,47 @@ def phone_lookup_candidates(phone_raw: str) -> list[str]:
     return [normalized, digits, f"00{digits}"]
 
 
+# \w keeps the previous str.isalnum() semantics, so non-Latin (e.g. Cyrillic) names survive.
+_USERNAME_STRIP = re.compile(r"[^\w.\-]+")
+_USERNAME_PROBE_BATCH = 32
+
+
+def _username_variant(candidate: str, index: int) -> str:
+    if index == 0:
+        return candidate
+    suffix = str(index)
+    return f"{candidate[: max(1, 150 - len(suffix))]}{suffix}"
+
+
 def safe_username(base: str) -> str:
-    candidate = "".join(ch for ch in base if ch.isalnum() or ch in {"_", "-", "."}).strip("_-.")[:150] or "user"
-    current = candidate
-    index = 1
-    while User.objects.filter(username__iexact=current).exists():
-        suffix = str(index)
-        current = f"{candidate[: max(1, 150 - len(suffix))]}{suffix}"
+    candidate = _USERNAME_STRIP.sub("", base).strip("_-.")[:150] or "user"
+    # Probe the first few variants in one equality query against the Lower(username) unique index.
+    variants = [_username_variant(candidate, index) for index in range(_USERNAME_PROBE_BATCH)]
+    taken = set(
+        User.objects.filter(username__lower__in=[variant.lower() for variant in variants])
+        .annotate(username_lower=Lower("username"))
+        .values_list("username_lower", flat=True)
+    )
+    for variant in variants:
+        if variant.lower() not in taken:
+            return variant
+
+    # Heavily contended base: load every name sharing the prefix once. Every variant starts
+    # with candidate[:140] even after truncation to 150 chars (suffixes up to 10 digits).
+    taken = {
+        name.lower()
+        for name in User.objects.filter(username__istartswith=candidate[:140])
+        .values_list("username", flat=True)
+        .iterator()
+    }
+    index = _USERNAME_PROBE_BATCH
+    while _username_variant(candidate, index).lower() in taken:
         index += 1
-    return current
+    return _username_variant(candidate, index)
 
 
-def hash_magic_token(token: str) -> str:
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def hash_magic_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def generate_magic_token() -> str:
@@ -70,9 +105,8 @@ class MagicLinkLimitMetadata:
 
 
 def build_magic_link_url(token: str) -> str:
-    public_app_url = settings.PUBLIC_APP_URL.rstrip("/")
     # Use URL fragment to avoid leaking one-time tokens via Referer/logs/proxies.
-    return f"{public_app_url}/auth/telegram#token={token}"
+    return f"{public_app_url()}/auth/telegram#token={token}"
 
 
 def get_magic_link_limit_metadata(token: str) -> MagicLinkLimitMetadata:
@@ -125,13 +159,24 @@ def create_magic_link(
 
 def consume_magic_token(token: str) -> TelegramMagicLink:
     token_hash = hash_magic_token(token)
-    link = TelegramMagicLink.objects.select_for_update().filter(token_hash=token_hash).first()
+    # Claim the link in one conditional UPDATE ... RETURNING: no row lock round-trip, and two
+    # concurrent logins cannot both consume it.
+    table = connection.ops.quote_name(TelegramMagicLink._meta.db_table)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    claimed = list(
+        TelegramMagicLink.objects.raw(
+            f"UPDATE {table} SET used_at = %s "
+            "WHERE token_hash = %s AND used_at IS NULL AND expires_at > %s RETURNING *",
+            [now, token_hash, now],
+        )
+    )
+    if claimed:
+        return claimed[0]
+
+    # Failure path only: tell the caller why the link was rejected.
+    link = TelegramMagicLink.objects.filter(token_hash=token_hash).only("used_at", "expires_at").first()
     if not link:
         raise APIError("Login link is invalid.", code="invalid_magic_link", status=401)
     if link.is_used:
         raise APIError("Login link has already been used.", code="magic_link_used", status=401)
-    if link.is_expired:
-        raise APIError("Login link has expired.", code="magic_link_expired", status=401)
-    link.used_at = timezone.now()
-    link.save(update_fields=["used_at"])
-    return link
+    raise APIError("Login link has expired.", code="magic_link_expired", status=401)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from datetime import timedelta
+from unittest import skipUnless
 from unittest.mock import patch
+from urllib.parse import parse_qsl
 
 import fakeredis
 from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.db import connection
 from django.test import Client, TestCase, override_settings
 from django.utils import timezone
 
-from apps.accounts.models import PasswordResetToken, RefreshToken, User
+from apps.accounts.api import _parse_telegram_init_data
+from apps.accounts.models import PasswordResetToken, RefreshToken, TelegramMagicLink, User
 from apps.accounts.password_reset import hash_reset_token
+from apps.common.deletion import check_db_on_delete
 
 
 @override_settings(
@@ -74,6 +82,46 @@ class AuthSecuritySmokeTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("access", response.json())
 
+    def test_refresh_accepts_token_stored_with_legacy_sha256_digest(self):
+        register_response = self._post_json(
+            "/api/auth/register",
+            {
+                "email": "legacyhash@example.com",
+                "username": "legacyhashuser",
+                "password": "Qv7!mZr2TpWx",
+            },
+        )
+        self.assertEqual(register_response.status_code, 200)
+        refresh = register_response.cookies[settings.AUTH_REFRESH_COOKIE_NAME].value
+        RefreshToken.objects.update(token_hash=hashlib.sha256(refresh.encode("utf-8")).digest())
+
+        response = self._post_json("/api/auth/refresh")
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_of_locked_live_token_is_retryable_and_keeps_cookies(self):
+        register_response = self._post_json(
+            "/api/auth/register",
+            {
+                "email": "lockedrefresh@example.com",
+                "username": "lockedrefreshuser",
+                "password": "L0cked!StrongPass",
+            },
+        )
+        self.assertEqual(register_response.status_code, 200)
+
+        # SQLite has no row locks: emulate select_for_update(skip_locked=True) skipping the row
+        # that a concurrent refresh holds.
+        with patch.object(RefreshToken.objects, "select_for_update", lambda **kwargs: RefreshToken.objects.none()):
+            response = self._post_json("/api/auth/refresh")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json().get("code"), "refresh_in_progress")
+        self.assertNotIn(settings.AUTH_REFRESH_COOKIE_NAME, response.cookies)
+        self.assertNotIn(settings.AUTH_REFRESH_SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(RefreshToken.objects.filter(revoked_at__isnull=False).exists())
+
+        response = self._post_json("/api/auth/refresh")
+        self.assertEqual(response.status_code, 200)
+
     def test_refresh_without_cookie_and_without_body_returns_no_refresh(self):
         anonymous = Client()
         response = anonymous.post("/api/auth/refresh", data="", content_type="application/json")
@@ -151,3 +199,89 @@ class AuthSecuritySmokeTests(TestCase):
         self.assertTrue(current.used_at is not None)
         self.assertTrue(other.used_at is not None)
         self.assertEqual(RefreshToken.objects.filter(user=user, revoked_at__isnull=True).count(), 0)
+
+    def test_login_upgrades_legacy_pbkdf2_hash(self):
+        user = User.objects.create(
+            username="legacyuser",
+            email="legacy@example.com",
+            password=make_password("L3gacy!StrongPass", hasher="pbkdf2_sha256"),
+        )
+
+        response = self._post_json("/api/auth/login", {"email": "legacy@example.com", "password": "L3gacy!StrongPass"})
+        self.assertEqual(response.status_code, 200)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2"))
+
+    def test_register_rejects_case_variant_duplicates(self):
+        User.objects.create(username="CaseUser", email="case@example.com")
+
+        response = self._post_json(
+            "/api/auth/register",
+            {"email": "other@example.com", "username": "caseuser", "password": "S3cur3!Passw0rd"},
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["fields"], {"username": "Username already exists."})
+
+        response = self._post_json(
+            "/api/auth/register",
+            {"email": "CASE@example.com", "username": "freshuser", "password": "S3cur3!Passw0rd"},
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["fields"], {"email": "Email already exists."})
+
+        response = self._post_json(
+            "/api/auth/register",
+            {"email": "Case@Example.com", "username": "CASEUSER", "password": "S3cur3!Passw0rd"},
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            response.json()["fields"],
+            {"email": "Email already exists.", "username": "Username already exists."},
+        )
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_forgot_password_sends_email_after_commit(self):
+        User.objects.create(username="forgetful", email="forgetful@example.com")
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self._post_json("/api/auth/forgot-password", {"emailOrUsername": "forgetful@example.com"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+        for callback in callbacks:
+            callback().result(timeout=5)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["forgetful@example.com"])
+
+    def test_telegram_init_data_parser_matches_parse_qsl(self):
+        samples = [
+            "auth_date=1700000000&hash=abc&id=42&user=%7B%22first_name%22%3A%22Ann%20B%22%7D",
+            "a=1&&b=&c&hash=&d=x%2By+z&a=2",
+            "&=orphan&key%3Dwith%3Dequals=v%26v&first_name=%D0%90%D0%BD%D1%8F&hash=h1&hash=h2",
+            "",
+        ]
+        for init_data in samples:
+            expected = dict(parse_qsl(init_data, keep_blank_values=True))
+            expected_hash = expected.pop("hash", None)
+            self.assertEqual(_parse_telegram_init_data(init_data), (expected, expected_hash), init_data)
+
+
+class UserDeletionTests(TestCase):
+    def test_deleting_user_removes_tokens_and_detaches_magic_links(self):
+        user = User.objects.create(username="deleted", email="deleted@example.com")
+        RefreshToken.objects.create(user=user, expires_at=timezone.now() + timedelta(days=1))
+        PasswordResetToken.objects.create(user=user, token_hash=b"r" * 32)
+        link = TelegramMagicLink.objects.create(user=user, token_hash=b"m" * 32, expires_at=timezone.now())
+
+        user.delete()
+
+        self.assertFalse(RefreshToken.objects.exists())
+        self.assertFalse(PasswordResetToken.objects.exists())
+        link.refresh_from_db()
+        self.assertIsNone(link.user_id)
+
+    @skipUnless(connection.vendor == "postgresql", "ON DELETE actions are only moved into Postgres")
+    def test_user_foreign_keys_keep_database_on_delete_actions(self):
+        self.assertEqual(check_db_on_delete(databases=["default"]), [])
+
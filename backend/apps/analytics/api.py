@@ -1,15 +1,18 @@
 import calendar
 from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 
+from django.db.models import Case, Count, F, Q, QuerySet, Sum, When
+from django.db.models.functions import Coalesce, ExtractMonth, TruncDate
 from django.utils import timezone
 from ninja import Query, Router
 
+from apps.analytics.cache import cached_payload
 from apps.analytics.schemas import AnalyticsPayloadSchema
 from apps.common.auth import JWTAuth
 from apps.common.exceptions import APIError
 from apps.tasks.models import Task, TaskOccurrence
-from apps.tasks.occurrences import ensure_occurrences_for_tasks, is_occurrence_overdue, occurrence_elapsed_seconds
+from apps.tasks.occurrences import ensure_occurrences_for_tasks, occurrence_elapsed_seconds
 
 router = Router(tags=["analytics"], auth=JWTAuth())
 
@@ -32,54 +35,110 @@ def _normalize_period_percents(periods: list[dict]) -> list[dict]:
     return periods
 
 
-def _query_range_occurrences(user, start_date: date, end_date: date) -> list[TaskOccurrence]:
-    tasks = list(Task.objects.filter(owner=user).select_related("category").order_by("id"))
+def _query_range_occurrences(user, start_date: date, end_date: date) -> QuerySet[TaskOccurrence]:
+    tasks = list(Task.objects.filter(owner=user).order_by("id"))
     if not tasks:
-        return []
+        return TaskOccurrence.objects.none()
     ensure_occurrences_for_tasks(tasks, range_start=start_date, range_end=end_date)
-    return list(
-        TaskOccurrence.objects.filter(task_id__in=[task.id for task in tasks], date__gte=start_date, date__lte=end_date)
-        .select_related("task", "task__category")
-        .order_by("date", "task_id")
+    return TaskOccurrence.objects.filter(task__owner=user, date__gte=start_date, date__lte=end_date)
+
+
+def _created_counts(user, start_dt: datetime, end_dt: datetime) -> dict[date, int]:
+    # Bucketed by UTC calendar day, like occurrence dates.
+    rows = (
+        Task.objects.filter(owner=user, created_at__gte=start_dt, created_at__lt=end_dt)
+        .order_by()
+        .values(day=TruncDate("created_at", tzinfo=UTC))
+        .annotate(count=Count("id"))
     )
+    return {row["day"]: row["count"] for row in rows}
+
+
+_EMPTY_COUNTS = {"total": 0, "completed": 0, "overdue": 0, "timer_seconds": 0}
 
 
-def _created_counts(user, start_dt: datetime, end_dt: datetime) -> dict[str, int]:
-    counts: dict[str, int] = defaultdict(int)
-    created_tasks = Task.objects.filter(owner=user, created_at__gte=start_dt, created_at__lt=end_dt).only("created_at")
-    for task in created_tasks:
-        counts[task.created_at.date().isoformat()] += 1
+def _bucket_counts(occurrences: QuerySet[TaskOccurrence], bucket, now: datetime) -> dict:
+    """
+    Per-bucket total/completed/overdue counts and timer seconds, grouped in the database.
+
+    Mirrors is_occurrence_overdue and occurrence_elapsed_seconds: an open occurrence is overdue
+    once its day has passed, or on the current (UTC) day once its deadline time has passed.
+    Only occurrences with a running timer need the wall clock, so those few rows are loaded
+    and added in Python.
+    """
+    completed_q = Q(status=TaskOccurrence.Status.COMPLETED)
+    today = now.date()
+    overdue_q = ~completed_q & (
+        Q(date__lt=today)
+        | Q(date=today, task__has_deadline=True, task__deadline_time__isnull=False, task__deadline_time__lt=now.time())
+    )
+    capped_timer_seconds = Case(
+        When(
+            task__timer_duration_seconds__gt=0,
+            timer_seconds__gt=F("task__timer_duration_seconds"),
+            then=F("task__timer_duration_seconds"),
+        ),
+        default=F("timer_seconds"),
+    )
+    rows = (
+        occurrences.order_by()
+        .values(bucket=bucket)
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=completed_q),
+            overdue=Count("id", filter=overdue_q),
+            timer_seconds=Coalesce(Sum(capped_timer_seconds, filter=Q(timer_running_since__isnull=True)), 0),
+        )
+    )
+    counts = {row.pop("bucket"): row for row in rows}
+
+    running = (
+        occurrences.filter(timer_running_since__isnull=False)
+        .select_related("task")
+        .only("timer_seconds", "timer_running_since", "task__timer_duration_seconds")
+        .annotate(bucket=bucket)
+    )
+    for occurrence in running:
+        counts[occurrence.bucket]["timer_seconds"] += occurrence_elapsed_seconds(occurrence.task, occurrence, now=now)
     return counts
 
 
-def _bucket_metrics(occurrences: list[TaskOccurrence], now: datetime) -> dict:
-    total = len(occurrences)
-    completed = sum(1 for occurrence in occurrences if occurrence.status == TaskOccurrence.Status.COMPLETED)
-    overdue = sum(1 for occurrence in occurrences if is_occurrence_overdue(occurrence.task, occurrence, now=now))
-    timer_seconds = sum(occurrence_elapsed_seconds(occurrence.task, occurrence, now=now) for occurrence in occurrences)
-    timer_minutes = timer_seconds // 60
+def _sum_counts(buckets) -> dict:
+    totals = dict(_EMPTY_COUNTS)
+    for counts in buckets:
+        for key in totals:
+            totals[key] += counts[key]
+    return totals
+
+
+def _bucket_metrics(counts: dict) -> dict:
+    total = counts["total"]
+    completed = counts["completed"]
     return {
         "total": total,
         "completed": completed,
-        "overdue": overdue,
+        "overdue": counts["overdue"],
         "productivity": _pct(completed, total),
-        "timerMinutes": int(timer_minutes),
+        "timerMinutes": int(counts["timer_seconds"] // 60),
     }
 
 
-def _category_stats(occurrences: list[TaskOccurrence]) -> list[dict]:
-    total_occurrences = len(occurrences)
+def _category_stats(occurrences: QuerySet[TaskOccurrence]) -> list[dict]:
     buckets: dict[str, dict] = defaultdict(lambda: {"name": "", "total": 0, "completed": 0})
-
-    for occurrence in occurrences:
-        task = occurrence.task
-        name = task.category.name if task.category_id else "Study"
+    rows = (
+        occurrences.order_by()
+        .values(category_name=F("task__category__name"))
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(status=TaskOccurrence.Status.COMPLETED)))
+    )
+    for row in rows:
+        # Uncategorized tasks share the "Study" bucket, including with a category of that name.
+        name = "Study" if row["category_name"] is None else row["category_name"]
         bucket = buckets[name]
         bucket["name"] = name
-        bucket["total"] += 1
-        if occurrence.status == TaskOccurrence.Status.COMPLETED:
-            bucket["completed"] += 1
+        bucket["total"] += row["total"]
+        bucket["completed"] += row["completed"]
 
+    total_occurrences = sum(bucket["total"] for bucket in buckets.values())
     result = []
     for bucket in buckets.values():
         result.append(
@@ -95,8 +154,8 @@ def _category_stats(occurrences: list[TaskOccurrence]) -> list[dict]:
     return result
 
 
-def _build_stats(occurrences: list[TaskOccurrence], created_count: int, now: datetime) -> dict:
-    metrics = _bucket_metrics(occurrences, now=now)
+def _build_stats(counts: dict, created_count: int) -> dict:
+    metrics = _bucket_metrics(counts)
     return {
         "total": metrics["total"],
         "completed": metrics["completed"],
@@ -120,16 +179,13 @@ def _weekly_payload(user, target_date: date) -> dict:
         timezone.make_aware(datetime.combine(start_date, datetime.min.time())),
         timezone.make_aware(datetime.combine(end_date + timedelta(days=1), datetime.min.time())),
     )
-    occurrences_by_day: dict[date, list[TaskOccurrence]] = defaultdict(list)
-    for occurrence in occurrences:
-        occurrences_by_day[occurrence.date].append(occurrence)
+    counts_by_day = _bucket_counts(occurrences, F("date"), now=now)
 
     trend_data = []
     productive_periods = []
     for idx in range(7):
         current = start_date + timedelta(days=idx)
-        bucket_occurrences = occurrences_by_day.get(current, [])
-        metrics = _bucket_metrics(bucket_occurrences, now=now)
+        metrics = _bucket_metrics(counts_by_day.get(current, _EMPTY_COUNTS))
         label = current.strftime("%a")
         trend_data.append(
             {
@@ -138,7 +194,7 @@ def _weekly_payload(user, target_date: date) -> dict:
                 "completed": metrics["completed"],
                 "overdue": metrics["overdue"],
                 "productivity": metrics["productivity"],
-                "created": created_map.get(current.isoformat(), 0),
+                "created": created_map.get(current, 0),
                 "timerMinutes": metrics["timerMinutes"],
             }
         )
@@ -155,7 +211,7 @@ def _weekly_payload(user, target_date: date) -> dict:
     _normalize_period_percents(productive_periods)
     return {
         "rangeLabel": f"Week of {start_date.strftime('%b %d, %Y')}",
-        "stats": _build_stats(occurrences, created_count=sum(created_map.values()), now=now),
+        "stats": _build_stats(_sum_counts(counts_by_day.values()), created_count=sum(created_map.values())),
         "trendData": trend_data,
         "categoryStats": _category_stats(occurrences),
         "productivePeriods": productive_periods,
@@ -173,17 +229,14 @@ def _monthly_payload(user, year: int, month: int) -> dict:
     created_map = _created_counts(user, start_dt=start_dt, end_dt=end_dt)
 
     occurrences = _query_range_occurrences(user, start_date=start_date, end_date=end_date)
-    occurrences_by_day: dict[date, list[TaskOccurrence]] = defaultdict(list)
-    for occurrence in occurrences:
-        occurrences_by_day[occurrence.date].append(occurrence)
+    counts_by_day = _bucket_counts(occurrences, F("date"), now=now)
 
     trend_data = []
     day_periods = []
 
     for day in range(1, day_count + 1):
         current = date(year, month, day)
-        bucket_occurrences = occurrences_by_day.get(current, [])
-        metrics = _bucket_metrics(bucket_occurrences, now=now)
+        metrics = _bucket_metrics(counts_by_day.get(current, _EMPTY_COUNTS))
         label = str(day)
         trend_data.append(
             {
@@ -192,7 +245,7 @@ def _monthly_payload(user, year: int, month: int) -> dict:
                 "completed": metrics["completed"],
                 "overdue": metrics["overdue"],
                 "productivity": metrics["productivity"],
-                "created": created_map.get(current.isoformat(), 0),
+                "created": created_map.get(current, 0),
                 "timerMinutes": metrics["timerMinutes"],
             }
         )
@@ -210,7 +263,7 @@ def _monthly_payload(user, year: int, month: int) -> dict:
 
     return {
         "rangeLabel": date(year, month, 1).strftime("%B %Y"),
-        "stats": _build_stats(occurrences, created_count=sum(created_map.values()), now=now),
+        "stats": _build_stats(_sum_counts(counts_by_day.values()), created_count=sum(created_map.values())),
         "trendData": trend_data,
         "categoryStats": _category_stats(occurrences),
         "productivePeriods": productive_periods,
@@ -226,20 +279,16 @@ def _yearly_payload(user, year: int) -> dict:
 
     created_map = _created_counts(user, start_dt=start_dt, end_dt=end_dt)
     occurrences = _query_range_occurrences(user, start_date=start_date, end_date=end_date)
-    occurrences_by_month: dict[int, list[TaskOccurrence]] = defaultdict(list)
-    for occurrence in occurrences:
-        occurrences_by_month[occurrence.date.month].append(occurrence)
+    counts_by_month = _bucket_counts(occurrences, ExtractMonth("date"), now=now)
 
     created_by_month: dict[int, int] = defaultdict(int)
-    for date_key, count in created_map.items():
-        month = date.fromisoformat(date_key).month
-        created_by_month[month] += count
+    for day, count in created_map.items():
+        created_by_month[day.month] += count
 
     trend_data = []
     productive_periods = []
     for month in range(1, 13):
-        bucket_occurrences = occurrences_by_month.get(month, [])
-        metrics = _bucket_metrics(bucket_occurrences, now=now)
+        metrics = _bucket_metrics(counts_by_month.get(month, _EMPTY_COUNTS))
         label = calendar.month_abbr[month]
         trend_data.append(
             {
@@ -265,7 +314,7 @@ def _yearly_payload(user, year: int) -> dict:
     _normalize_period_percents(productive_periods)
     return {
         "rangeLabel": str(year),
-        "stats": _build_stats(occurrences, created_count=sum(created_map.values()), now=now),
+        "stats": _build_stats(_sum_counts(counts_by_month.values()), created_count=sum(created_map.values())),
         "trendData": trend_data,
         "categoryStats": _category_stats(occurrences),
         "productivePeriods": productive_periods,
@@ -274,18 +323,21 @@ def _yearly_payload(user, year: int) -> dict:
 
 @router.get("/weekly", response=AnalyticsPayloadSchema)
 def weekly_analytics(request, date_value: date = Query(..., alias="date")):
-    return _weekly_payload(request.auth, target_date=date_value)
+    user = request.auth
+    return cached_payload(user.id, f"weekly:{date_value.isoformat()}", lambda: _weekly_payload(user, target_date=date_value))
 
 
 @router.get("/monthly", response=AnalyticsPayloadSchema)
 def monthly_analytics(request, year: int = Query(...), month: int = Query(...)):
     if month < 1 or month > 12:
         raise APIError("Month must be between 1 and 12.", code="invalid_month", status=422, fields={"month": "out_of_range"})
-    return _monthly_payload(request.auth, year=year, month=month)
+    user = request.auth
+    return cached_payload(user.id, f"monthly:{year}-{month}", lambda: _monthly_payload(user, year=year, month=month))
 
 
 @router.get("/yearly", response=AnalyticsPayloadSchema)
 def yearly_analytics(request, year: int = Query(...)):
     if year < 1970 or year > 2200:
         raise APIError("Year is out of range.", code="invalid_year", status=422, fields={"year": "out_of_range"})
-    return _yearly_payload(request.auth, year=year)
+    user = request.auth
+    return cached_payload(user.id, f"yearly:{year}", lambda: _yearly_payload(user, year=year))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.analytics"
+
+    def ready(self):
+        # Registers the cache invalidation receivers.
+        import apps.analytics.cache  # noqa: F401
@@ -0,0 +1,79 @@
+from typing import Callable
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.tasks.models import Category, Task, TaskOccurrence
+
+# Payloads also depend on the clock (overdue deadlines, running timers), so even an unchanged
+# version is only trusted for a short while.
+PAYLOAD_TIMEOUT_SECONDS = 60
+
+
+def _version_key(user_id: int) -> str:
+    return f"analytics:version:{user_id}"
+
+
+def cached_payload(user_id: int, name: str, build: Callable[[], dict]) -> dict:
+    """
+    Return the cached analytics payload for this user, rebuilding it when any of their tasks,
+    occurrences or categories changed since it was stored.
+
+    The cache is an optimization only: if Redis is unavailable the payload is computed directly.
+    """
+    version_key = _version_key(user_id)
+    payload_key = f"analytics:payload:{user_id}:{name}"
+    try:
+        found = cache.get_many([version_key, payload_key])
+    except Exception:
+        return build()
+
+    version = found.get(version_key)
+    entry = found.get(payload_key)
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1]
+
+    payload = build()
+    try:
+        if version is None:
+            version = uuid4().hex
+            # add() so a concurrent invalidation is never overwritten with an older version.
+            if not cache.add(version_key, version, timeout=None):
+                return payload
+        cache.set(payload_key, (version, payload), timeout=PAYLOAD_TIMEOUT_SECONDS)
+    except Exception:
+        pass
+    return payload
+
+
+def invalidate_user(user_id: int | None) -> None:
+    if user_id is None:
+        return
+    try:
+        cache.set(_version_key(user_id), uuid4().hex, timeout=None)
+    except Exception:
+        # Entries still expire after PAYLOAD_TIMEOUT_SECONDS.
+        pass
+
+
+@receiver([post_save, post_delete], sender=Task)
+def _task_changed(sender, instance: Task, **kwargs) -> None:
+    invalidate_user(instance.owner_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def _category_changed(sender, instance: Category, **kwargs) -> None:
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=TaskOccurrence)
+def _occurrence_changed(sender, instance: TaskOccurrence, **kwargs) -> None:
+    # post_save only: a post_delete receiver would disable fast deletes of a task's occurrences.
+    # Occurrence deletes happen alongside a Task save or delete, which invalidates already.
+    if TaskOccurrence.task.is_cached(instance):
+        owner_id = instance.task.owner_id
+    else:
+        owner_id = Task.objects.filter(pk=instance.task_id).values_list("owner_id", flat=True).first()
+    invalidate_user(owner_id)
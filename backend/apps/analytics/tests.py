@@ -1,3 +1,139 @@
-from django.test import TestCase
+from __future__ import annotations
 
-# Create your tests here.
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from unittest.mock import Mock, patch
+
+from django.db.models import F
+from django.db.models.functions import ExtractMonth
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.analytics.api import _bucket_counts, _category_stats
+from apps.analytics.cache import cached_payload, invalidate_user
+from apps.tasks.models import Category, Task, TaskOccurrence
+from apps.tasks.occurrences import is_occurrence_overdue, occurrence_elapsed_seconds
+
+
+class AnalyticsAggregationParityTests(TestCase):
+    """The SQL buckets must agree with the per-occurrence Python helpers they replaced."""
+
+    now = datetime(2026, 3, 11, 12, 0, tzinfo=UTC)
+
+    def setUp(self):
+        self.user = User.objects.create(username="analytics", email="analytics@example.com")
+        work = Category.objects.create(user=self.user, name="Work")
+        today = self.now.date()
+        yesterday = today - timedelta(days=1)
+        tomorrow = today + timedelta(days=1)
+
+        def task(**fields) -> Task:
+            fields.setdefault("scheduled_date", today)
+            return Task.objects.create(owner=self.user, title="t", **fields)
+
+        def occurrence(task_obj: Task, day: date, **fields) -> None:
+            TaskOccurrence.objects.create(task=task_obj, date=day, **fields)
+
+        plain = task()
+        occurrence(plain, yesterday)
+        occurrence(plain, today)
+        occurrence(plain, tomorrow, status=TaskOccurrence.Status.COMPLETED, completed_at=self.now)
+
+        # Deadline today before and after now, plus past/future days with the same deadlines.
+        passed = task(category=work, has_deadline=True, deadline_time=time(9, 0))
+        pending = task(category=work, has_deadline=True, deadline_time=time(15, 0))
+        occurrence(passed, today)
+        occurrence(passed, tomorrow)
+        occurrence(pending, today)
+        occurrence(pending, yesterday)
+        occurrence(pending, date(2026, 2, 27), status=TaskOccurrence.Status.COMPLETED, completed_at=self.now)
+        occurrence(task(has_deadline=True, deadline_time=time(18, 0)), today)
+
+        capped = task(category=work, has_timer=True, timer_duration_seconds=600)
+        occurrence(capped, yesterday, timer_seconds=900)
+        occurrence(capped, today, timer_seconds=400, timer_running_since=self.now - timedelta(seconds=300))
+        occurrence(capped, tomorrow, timer_seconds=120, timer_running_since=self.now - timedelta(seconds=60))
+
+        uncapped = task(has_timer=True)
+        occurrence(uncapped, today, timer_seconds=50, timer_running_since=self.now - timedelta(seconds=70))
+        occurrence(uncapped, date(2026, 2, 27), timer_seconds=3000)
+        # A future start must not count negative elapsed time.
+        occurrence(uncapped, tomorrow, timer_seconds=10, timer_running_since=self.now + timedelta(seconds=30))
+
+        self.occurrences = TaskOccurrence.objects.filter(task__owner=self.user)
+
+    def _expected_counts(self, bucket_of) -> dict:
+        expected: dict = defaultdict(lambda: {"total": 0, "completed": 0, "overdue": 0, "timer_seconds": 0})
+        for occ in self.occurrences.select_related("task"):
+            counts = expected[bucket_of(occ.date)]
+            counts["total"] += 1
+            counts["completed"] += occ.status == TaskOccurrence.Status.COMPLETED
+            counts["overdue"] += is_occurrence_overdue(occ.task, occ, now=self.now)
+            counts["timer_seconds"] += occurrence_elapsed_seconds(occ.task, occ, now=self.now)
+        return dict(expected)
+
+    def test_daily_buckets_match_python_helpers(self):
+        counts = _bucket_counts(self.occurrences, F("date"), now=self.now)
+        self.assertEqual(counts, self._expected_counts(lambda day: day))
+
+    def test_monthly_buckets_match_python_helpers(self):
+        counts = _bucket_counts(self.occurrences, ExtractMonth("date"), now=self.now)
+        self.assertEqual(counts, self._expected_counts(lambda day: day.month))
+
+    def test_category_stats_put_uncategorized_tasks_under_study(self):
+        stats = {row["name"]: (row["total"], row["completed"]) for row in _category_stats(self.occurrences)}
+        self.assertEqual(stats, {"Work": (8, 1), "Study": (7, 1)})
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class AnalyticsPayloadCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="cached", email="cached@example.com")
+        self.category = Category.objects.create(user=self.user, name="Work")
+        self.task = Task.objects.create(owner=self.user, title="t", scheduled_date=date(2026, 3, 11))
+        self.occurrence = TaskOccurrence.objects.create(task=self.task, date=self.task.scheduled_date)
+        self.spare_category = Category.objects.create(user=self.user, name="Other")
+        self.spare_task = Task.objects.create(owner=self.user, title="u", scheduled_date=date(2026, 3, 12))
+        self.builds = 0
+
+    def _payload(self) -> dict:
+        def build() -> dict:
+            self.builds += 1
+            return {"build": self.builds}
+
+        return cached_payload(self.user.id, "weekly:2026-03-09", build)
+
+    def test_repeat_reads_are_served_from_cache(self):
+        self.assertEqual(self._payload(), {"build": 1})
+        self.assertEqual(self._payload(), {"build": 1})
+
+    def test_writes_invalidate_cached_payload(self):
+        writes = [
+            lambda: self.task.save(),
+            lambda: self.category.save(),
+            # A fresh instance, so the receiver has to look the owner up.
+            lambda: TaskOccurrence.objects.get(pk=self.occurrence.pk).save(),
+            lambda: self.spare_category.delete(),
+            lambda: self.spare_task.delete(),
+        ]
+        previous = self._payload()
+        for write in writes:
+            write()
+            current = self._payload()
+            self.assertNotEqual(current, previous)
+            previous = current
+
+    def test_other_users_writes_keep_cached_payload(self):
+        other = User.objects.create(username="other", email="other@example.com")
+        self._payload()
+        Task.objects.create(owner=other, title="t", scheduled_date=date(2026, 3, 11))
+        self.assertEqual(self._payload(), {"build": 1})
+
+    def test_cache_errors_fall_back_to_building_the_payload(self):
+        broken = Mock()
+        broken.get_many.side_effect = ConnectionError
+        broken.set.side_effect = ConnectionError
+        with patch("apps.analytics.cache.cache", broken):
+            self.assertEqual(self._payload(), {"build": 1})
+            self.assertEqual(self._payload(), {"build": 2})
+            invalidate_user(self.user.id)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.common"
+
+    def ready(self):
+        # Registers the ON DELETE system check.
+        import apps.common.deletion  # noqa: F401
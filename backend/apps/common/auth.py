@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from ninja.security import HttpBearer
 
-from apps.common.jwt import JWTDecodeError, decode_token
+from apps.common.jwt import JWTDecodeError, decode_access_token
 
 User = get_user_model()
 
@@ -9,7 +9,7 @@ User = get_user_model()
 class JWTAuth(HttpBearer):
     def authenticate(self, request, token):
         try:
-            payload = decode_token(token, expected_type="access")
+            payload = decode_access_token(token)
         except JWTDecodeError:
             return None
 
@@ -0,0 +1,10 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+# Small per-process pool for best-effort I/O (SMTP, Telegram Bot API) that must not hold up a response.
+# Jobs should not touch the database: connections opened in these threads are never closed by Django.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="background")
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    return _executor.submit(func, *args, **kwargs)
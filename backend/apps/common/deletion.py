@@ -0,0 +1,71 @@
+from django.apps import apps
+from django.core import checks
+from django.db import connections
+from django.db.models import CASCADE, SET_NULL
+
+# on_delete handlers for foreign keys whose Postgres constraint carries ON DELETE CASCADE /
+# ON DELETE SET NULL (added by a migration). On Postgres the database does the work, so the
+# collector neither loads nor deletes the related rows; other backends (SQLite in local dev
+# and tests) keep Django's Python-side behaviour.
+
+
+def PG_CASCADE(collector, field, sub_objs, using):
+    if connections[using].vendor != "postgresql":
+        CASCADE(collector, field, sub_objs, using)
+
+
+def PG_SET_NULL(collector, field, sub_objs, using):
+    if connections[using].vendor != "postgresql":
+        SET_NULL(collector, field, sub_objs, using)
+
+
+# Tell the collector not to evaluate sub_objs before calling the handler.
+PG_CASCADE.lazy_sub_objs = True
+PG_SET_NULL.lazy_sub_objs = True
+
+
+_PG_DELETE_ACTIONS = {PG_CASCADE: "c", PG_SET_NULL: "n"}  # pg_constraint.confdeltype codes
+
+
+@checks.register(checks.Tags.database)
+def check_db_on_delete(app_configs=None, databases=None, **kwargs):
+    """
+    Warn when a PG_CASCADE / PG_SET_NULL foreign key lost its ON DELETE action in Postgres.
+
+    Django's migration state does not know about the action, so an AlterField on one of these
+    fields recreates the constraint without it and user deletes start failing with IntegrityError.
+    """
+    fields = [
+        field
+        for model in apps.get_models()
+        for field in model._meta.local_fields
+        if field.remote_field is not None and field.remote_field.on_delete in _PG_DELETE_ACTIONS
+    ]
+    messages = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            continue
+        with connection.cursor() as cursor:
+            for field in fields:
+                cursor.execute(
+                    "SELECT con.confdeltype FROM pg_constraint con "
+                    "JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1] "
+                    "WHERE con.contype = 'f' AND con.conrelid = to_regclass(%s) "
+                    "AND cardinality(con.conkey) = 1 AND att.attname = %s",
+                    [connection.ops.quote_name(field.model._meta.db_table), field.column],
+                )
+                actions = {row[0] for row in cursor.fetchall()}
+                expected = _PG_DELETE_ACTIONS[field.remote_field.on_delete]
+                # No constraint yet: the table or its migration has not been applied.
+                if actions and actions != {expected}:
+                    messages.append(
+                        checks.Warning(
+                            f"{field.model._meta.label}.{field.name} uses {field.remote_field.on_delete.__name__} "
+                            f"but its foreign key in database '{alias}' has no matching ON DELETE action.",
+                            hint="Re-add the ON DELETE action in a migration (see accounts 0010_user_fk_db_on_delete).",
+                            obj=field,
+                            id="common.W001",
+                        )
+                    )
+    return messages
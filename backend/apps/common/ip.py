@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import ipaddress
 import os
+import socket
 from functools import lru_cache
 
 
@@ -26,10 +27,16 @@ def _trusted_proxy_nets() -> list[ipaddress._BaseNetwork]:
         except ValueError:
             # Misconfiguration should not silently expand trust; ignore bad entries.
             continue
-    return nets
+    # Merge overlapping/adjacent CIDRs so membership checks scan as few networks as possible.
+    return [
+        *ipaddress.collapse_addresses(n for n in nets if n.version == 4),
+        *ipaddress.collapse_addresses(n for n in nets if n.version == 6),
+    ]
 
 
+@lru_cache(maxsize=1024)
 def _ip_in_trusted_proxies(remote_addr: str) -> bool:
+    # REMOTE_ADDR is usually one of a handful of proxy/LB addresses, so memoize per address.
     nets = _trusted_proxy_nets()
     if not nets:
         return False
@@ -40,6 +47,21 @@ def _ip_in_trusted_proxies(remote_addr: str) -> bool:
     return any(remote_ip in net for net in nets)
 
 
+def _is_ip(value: str) -> bool:
+    # inet_pton is C-coded and as strict as ipaddress for dotted quads (no leading zeros,
+    # no short forms); IPv6 goes through ipaddress so scoped addresses stay accepted.
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+        return True
+    except (OSError, ValueError):
+        pass
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
 def request_ip(request) -> str:
     """
     Returns a best-effort client IP with a safe-by-default trust model.
@@ -52,7 +74,19 @@ def request_ip(request) -> str:
     - This intentionally ignores X-Forwarded-For from arbitrary clients to prevent spoofing.
     - If you run behind a reverse proxy, configure TRUSTED_PROXY_NETS to your proxy CIDRs
       (for example: "10.0.0.0/8,172.16.0.0/12,192.168.0.0/16" or your LB subnet).
+
+    The result is memoized on the request: rate-limit keys, token issuance and
+    audit fields all ask for it within the same request.
     """
+    try:
+        return request._client_ip
+    except AttributeError:
+        pass
+    request._client_ip = ip = _resolve_request_ip(request)
+    return ip
+
+
+def _resolve_request_ip(request) -> str:
     remote = (request.META.get("REMOTE_ADDR") or "").strip()
     if not remote:
         return "unknown"
@@ -61,22 +95,13 @@ def request_ip(request) -> str:
         xff = (request.META.get("HTTP_X_FORWARDED_FOR") or "").strip()
         if xff:
             for candidate in (part.strip() for part in xff.split(",")):
-                if not candidate:
-                    continue
-                try:
-                    ipaddress.ip_address(candidate)
-                except ValueError:
-                    continue
-                return candidate
+                if candidate and _is_ip(candidate):
+                    return candidate
 
         # Optional compatibility with some reverse-proxy setups.
         x_real_ip = (request.META.get("HTTP_X_REAL_IP") or "").strip()
-        if x_real_ip:
-            try:
-                ipaddress.ip_address(x_real_ip)
-                return x_real_ip
-            except ValueError:
-                pass
+        if x_real_ip and _is_ip(x_real_ip):
+            return x_real_ip
 
     # Fallback: the connecting peer.
     return remote
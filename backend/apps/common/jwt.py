@@ -1,23 +1,38 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
-from uuid import uuid4
 
 import jwt
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from jwt import ExpiredSignatureError, InvalidTokenError
 
+from apps.common.utils import uuid7
+
 
 class JWTDecodeError(Exception):
     pass
 
 
+# Built once so decode_token does not merge per-call options; we never issue aud/iss claims.
+_decoder = jwt.PyJWT(options={"verify_aud": False, "verify_iss": False, "require": ["exp", "sub", "jti"]})
+
+
 def _base_payload(user_id: int, token_type: str, lifetime: timedelta) -> dict:
-    now = datetime.now(UTC)
+    # Whole seconds, matching the NumericDate PyJWT writes; callers can store exp as-is.
+    now = datetime.now(UTC).replace(microsecond=0)
     return {
         "sub": str(user_id),
         "token_type": token_type,
-        "iat": int(now.timestamp()),
-        "exp": int((now + lifetime).timestamp()),
-        "jti": str(uuid4()),
+        "iat": now,
+        "exp": now + lifetime,
+        # Kept as a UUID so callers can store it without re-parsing; encoded as a string.
+        # Time-ordered so refresh token rows append to the end of the jti index.
+        "jti": uuid7(),
     }
 
 
@@ -27,7 +42,7 @@ def create_access_token(user_id: int) -> tuple[str, dict]:
         token_type="access",
         lifetime=timedelta(minutes=settings.JWT_ACCESS_TTL_MINUTES),
     )
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM, json_encoder=DjangoJSONEncoder)
     return token, payload
 
 
@@ -37,13 +52,13 @@ def create_refresh_token(user_id: int) -> tuple[str, dict]:
         token_type="refresh",
         lifetime=timedelta(days=settings.JWT_REFRESH_TTL_DAYS),
     )
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM, json_encoder=DjangoJSONEncoder)
     return token, payload
 
 
 def decode_token(token: str, expected_type: str | None = None) -> dict:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = _decoder.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
     except ExpiredSignatureError as exc:
         raise JWTDecodeError("Token expired.") from exc
     except InvalidTokenError as exc:
@@ -52,3 +67,40 @@ def decode_token(token: str, expected_type: str | None = None) -> dict:
     if expected_type and payload.get("token_type") != expected_type:
         raise JWTDecodeError("Token type mismatch.")
     return payload
+
+
+# Access tokens are re-sent on every request; remember verified payloads so repeats skip the HMAC
+# and JSON parse. Keyed by a digest so raw bearer tokens are not kept in memory. Only tokens that
+# passed decode_token are stored, and a hit is still rejected once its exp has passed.
+_ACCESS_CACHE_SIZE = 4096
+_access_cache: OrderedDict[bytes, dict] = OrderedDict()
+_access_cache_lock = threading.Lock()
+
+
+def decode_access_token(token: str) -> dict:
+    """decode_token(token, expected_type="access") with a per-process cache of verified payloads.
+
+    The returned dict is shared between requests and must not be mutated.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _access_cache_lock:
+        payload = _access_cache.get(key)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                _access_cache.move_to_end(key)
+                return payload
+            del _access_cache[key]
+
+    payload = decode_token(token, expected_type="access")
+    with _access_cache_lock:
+        _access_cache[key] = payload
+        if len(_access_cache) > _ACCESS_CACHE_SIZE:
+            _access_cache.popitem(last=False)
+    return payload
+
+
+@receiver(setting_changed)
+def _reset_access_cache(*, setting: str, **kwargs) -> None:
+    if setting in {"SECRET_KEY", "JWT_ALGORITHM"}:
+        with _access_cache_lock:
+            _access_cache.clear()
@@ -3,11 +3,10 @@ import math
 import re
 import time
 from dataclasses import dataclass
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Callable
 from uuid import uuid4
 
-from redis.exceptions import WatchError
 from django_redis import get_redis_connection
 
 from apps.common.ip import request_ip
@@ -29,6 +28,8 @@ class RateLimitRule:
 _RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*([smhd])\s*$", re.IGNORECASE)
 _UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
 
+# Rates are a handful of constant strings fixed at import; parse each once.
+@lru_cache(maxsize=64)
 def parse_rate(rate: str) -> tuple[int, int]:
     match = _RATE_RE.match(rate or "")
     if not match:
@@ -51,34 +52,26 @@ def enforce_rate_limit(scope: str, rule_name: str, identifier: str, rate: str) -
     key = _rate_key(scope, rule_name, identifier)
 
     redis = get_redis_connection("default")
-    for _ in range(5):
-        now_ms = int(time.time() * 1000)
-        member = f"{now_ms}:{uuid4().hex}"
-        pipeline = redis.pipeline()
-        try:
-            pipeline.watch(key)
-            pipeline.zremrangebyscore(key, 0, now_ms - window_ms)
-            current = int(pipeline.zcard(key))
-            oldest = pipeline.zrange(key, 0, 0, withscores=True)
-
-            if current >= limit:
-                retry_ms = window_ms
-                if oldest:
-                    oldest_score = int(oldest[0][1])
-                    retry_ms = window_ms - (now_ms - oldest_score)
-                raise RateLimitExceeded(retry_after=max(1, math.ceil(max(retry_ms, 0) / 1000)))
-
-            pipeline.multi()
-            pipeline.zadd(key, {member: now_ms})
-            pipeline.pexpire(key, window_ms)
-            pipeline.execute()
-            return
-        except WatchError:
-            continue
-        finally:
-            pipeline.reset()
-
-    raise RateLimitExceeded(retry_after=1)
+    now_ms = int(time.time() * 1000)
+    member = f"{now_ms}:{uuid4().hex}"
+    # Record the hit optimistically and read the window back in the same MULTI/EXEC,
+    # so an allowed request costs a single round-trip instead of WATCH + reads + EXEC.
+    pipeline = redis.pipeline(transaction=True)
+    pipeline.zremrangebyscore(key, 0, now_ms - window_ms)
+    pipeline.zadd(key, {member: now_ms})
+    pipeline.zcard(key)
+    pipeline.zrange(key, 0, 0, withscores=True)
+    pipeline.pexpire(key, window_ms)
+    _, _, current, oldest, _ = pipeline.execute()
+
+    if int(current) > limit:
+        # Rejected hits must not extend the window.
+        redis.zrem(key, member)
+        retry_ms = window_ms
+        if oldest:
+            oldest_score = int(oldest[0][1])
+            retry_ms = window_ms - (now_ms - oldest_score)
+        raise RateLimitExceeded(retry_after=max(1, math.ceil(max(retry_ms, 0) / 1000)))
 
 
 def rate_limit_rules(
@@ -132,6 +132,17 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# Argon2id first: new and upgraded hashes use it; PBKDF2 stays to verify existing hashes.
+ARGON2_TIME_COST = max(1, int(os.getenv("ARGON2_TIME_COST", "2")))
+ARGON2_MEMORY_COST = max(8, int(os.getenv("ARGON2_MEMORY_COST", "102400")))
+ARGON2_PARALLELISM = max(1, int(os.getenv("ARGON2_PARALLELISM", "8")))
+PASSWORD_HASHERS = [
+    "apps.accounts.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = os.getenv("DJANGO_TIME_ZONE", "UTC")
 USE_I18N = True
@@ -183,6 +194,8 @@ if not DEBUG:
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TTL_MINUTES = int(os.getenv("JWT_ACCESS_TTL_MINUTES", "15"))
 JWT_REFRESH_TTL_DAYS = int(os.getenv("JWT_REFRESH_TTL_DAYS", "7"))
+# Key for the keyed BLAKE2b refresh-token digests stored in the database; defaults to SECRET_KEY.
+REFRESH_TOKEN_HASH_KEY = os.getenv("REFRESH_TOKEN_HASH_KEY", "").strip() or SECRET_KEY
 
 # Shared Redis URL for cache/rate-limit (and Celery if introduced).
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/1")
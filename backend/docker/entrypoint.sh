@@ -77,12 +77,14 @@ if [ "${1:-}" = "" ]; then
   : "${GUNICORN_APP:=config.wsgi:application}"
   : "${PORT:=8000}"
   : "${WEB_CONCURRENCY:=1}"
+  : "${GUNICORN_THREADS:=4}"
   : "${GUNICORN_TIMEOUT:=60}"
 
   echo "[entrypoint] No command provided; starting gunicorn..."
   exec gunicorn "$GUNICORN_APP" \
     --bind "0.0.0.0:${PORT}" \
     --workers "${WEB_CONCURRENCY}" \
+    --threads "${GUNICORN_THREADS}" \
     --timeout "${GUNICORN_TIMEOUT}" \
     --access-logfile "-" \
     --error-logfile "-"
@@ -18,6 +18,7 @@ if [ "$role" = "web" ]; then
   exec gunicorn config.wsgi:application \
     --bind "0.0.0.0:${PORT:-8000}" \
     --workers "${WEB_CONCURRENCY:-2}" \
+    --threads "${GUNICORN_THREADS:-4}" \
     --timeout "${GUNICORN_TIMEOUT:-60}" \
     --access-logfile "-" \
     --error-logfile "-"